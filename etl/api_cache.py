@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+ONE_WEEK = 7 * 24 * 60 * 60
+
+
+class ApiCache(object):
+    """
+    On disk cache of raw Client.fetch responses so re-running the ETL after
+    changing a column or fixing a parser doesn't cost API calls.
+
+    Entries are content addressed, the file name is a hash of the method and
+    its params (cid, cycle, ...). Expired entries are ignored unless you ask for
+    them, and the least recently used entries are evicted once the cache grows
+    past max_bytes
+    """
+
+    def __init__(self, cache_dir="./data/cache/", ttl=ONE_WEEK, max_bytes=256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = sum(path.stat().st_size for path in self.cache_dir.glob("*.json"))
+
+    @staticmethod
+    def make_key(method, params):
+        params = {key: str(value) for key, value in params.items()}
+        raw = json.dumps({"method": method, "params": params}, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, method, params, allow_expired=False):
+        """
+        Returns the cached response or None. allow_expired is for offline replay,
+        where a stale response beats no response
+        """
+        path = self._path_for(self.make_key(method, params))
+        try:
+            with open(path) as infile:
+                entry = json.load(infile)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if not allow_expired and time.time() - entry["fetched_at"] > self.ttl:
+            return None
+
+        # bump the mtime so eviction sees this as recently used
+        os.utime(path)
+        return entry["response"]
+
+    def put(self, method, params, response):
+        key = self.make_key(method, params)
+        path = self._path_for(key)
+        entry = {
+            "method": method,
+            "params": params,
+            "fetched_at": time.time(),
+            "response": response,
+        }
+
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as outfile:
+            json.dump(entry, outfile)
+
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp_path.replace(path)
+            self._total_bytes += path.stat().st_size - old_size
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # least recently used first, stop once we're back under the limit
+        paths = sorted(self.cache_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for path in paths:
+            if self._total_bytes <= self.max_bytes:
+                break
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            self._total_bytes -= size
+
+    def _path_for(self, key):
+        return self.cache_dir / f"{key}.json"
@@ -0,0 +1,130 @@
+"""
+Benchmarks for every stage of the pipeline, run from the etl directory:
+
+    python -m bench --scales 1 10 --cycles 2022 2020
+    python -m bench --scales 100 --stages etl aggregate --compare data/bench/<earlier run>.json
+
+Each scale gets its own synthetic corpus in a temp dir (every real candidate
+copied `scale` times, the real cycle copied to each of --cycles), results
+go to one json file per run so two runs can be compared
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime
+
+from server.data.paths import DEFAULT_CYCLE
+from bench.corpus import build_corpus
+from bench.stages import STAGES
+
+RESULTS_DIR = "./data/bench/"
+
+# anything this much slower than the baseline gets called out
+REGRESSION_THRESHOLD = 1.10
+
+
+def run(scales=(1,), cycles=(DEFAULT_CYCLE,), stages=None, keep=False):
+    stages = stages or list(STAGES.keys())
+    results = {}
+    for scale in scales:
+        label = f"{scale}x_{len(cycles)}_cycles"
+        root = tempfile.mkdtemp(prefix=f"bench_{label}_")
+        try:
+            print(f"Building {label} corpus in {root}")
+            build_corpus(root, scale=scale, cycles=cycles)
+
+            results[label] = {}
+            for stage in stages:
+                print(f"Running {stage} on {label}")
+                results[label][stage] = STAGES[stage](root, list(cycles))
+        finally:
+            if not keep:
+                shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": list(scales),
+        "cycles": list(cycles),
+        "results": results,
+    }
+
+
+def save(report, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    file_path = os.path.join(results_dir, f"bench_{report['started_at'].replace(':', '')}.json")
+    with open(file_path, "w") as outfile:
+        json.dump(report, outfile, indent=2, sort_keys=True)
+
+    print(f"Saved results to {file_path}")
+    return file_path
+
+
+def compare(baseline, report, threshold=REGRESSION_THRESHOLD):
+    """
+    Every latency that went up, or throughput that went down, by more than
+    threshold between two reports. Returns [(metric path, before, after)]
+    """
+    regressions = []
+    before = _flatten(baseline["results"])
+    for path, after in _flatten(report["results"]).items():
+        if path not in before or not before[path] or not after:
+            continue
+        if path.endswith("_ms") and after / before[path] > threshold:
+            regressions.append((path, before[path], after))
+        elif path.endswith("items_per_s") and before[path] / after > threshold:
+            regressions.append((path, before[path], after))
+
+    return regressions
+
+
+def _flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)):
+            flat[path] = value
+
+    return flat
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pull, etl and serving paths")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--cycles", nargs="+", default=[DEFAULT_CYCLE])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES.keys()), default=None)
+    parser.add_argument("--compare", help="an earlier results file to check for regressions")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic corpora around")
+    args = parser.parse_args()
+
+    report = run(scales=args.scales, cycles=args.cycles, stages=args.stages, keep=args.keep)
+    save(report)
+
+    if args.compare:
+        with open(args.compare) as infile:
+            baseline = json.load(infile)
+        regressions = compare(baseline, report)
+        for path, before, after in regressions:
+            print(f"REGRESSION {path}: {before} -> {after}")
+        print(f"{len(regressions)} regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import contextlib
+import csv
+import os
+
+from server.data import etl
+from server.data.paths import DEFAULT_CYCLE
+from server.data.utils import list_files_in_dir
+from bench.stats import quiet
+
+PER_CANDIDATE_TYPES = [etl.CONTRIBUTORS, etl.INDUSTRIES, etl.SECTORS, etl.SUMMARIES]
+
+
+@contextlib.contextmanager
+def working_dir(path):
+    # every path in the etl is relative to ./data/, so a corpus is just a cwd
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def synthetic_cid(cid, copy):
+    # copy 0 is the real candidate
+    return cid if copy == 0 else f"{cid}x{copy}"
+
+
+def build_corpus(root, scale=1, cycles=(DEFAULT_CYCLE,), source_dir="./data"):
+    """
+    Lays out a ./data/ tree under root: every real candidate `scale` times over
+    (same state, new cid) and the real cycle's files copied to each of `cycles`.
+    Then builds the seeds for it, so every stage has something to read
+    """
+    source_dir = os.path.abspath(source_dir)
+    data_dir = os.path.join(root, "data")
+
+    states_dir = os.path.join(data_dir, "states")
+    os.makedirs(states_dir, exist_ok=True)
+    for file_name in list_files_in_dir(os.path.join(source_dir, "states")):
+        headers, rows = _read_csv(os.path.join(source_dir, "states", file_name))
+        copies = [
+            {**row, "cid": synthetic_cid(row["cid"], copy)}
+            for copy in range(scale)
+            for row in rows
+        ]
+        _write_csv(os.path.join(states_dir, file_name), headers, copies)
+
+    for data_type in PER_CANDIDATE_TYPES:
+        source_cycle_dir = os.path.join(source_dir, data_type, DEFAULT_CYCLE)
+        for file_name in list_files_in_dir(source_cycle_dir):
+            headers, rows = _read_csv(os.path.join(source_cycle_dir, file_name))
+            cid = file_name.split(".")[0]
+            for cycle in cycles:
+                cycle_dir = os.path.join(data_dir, data_type, cycle)
+                os.makedirs(cycle_dir, exist_ok=True)
+                for copy in range(scale):
+                    new_cid = synthetic_cid(cid, copy)
+                    copies = [_relabel(row, new_cid, cycle) for row in rows]
+                    _write_csv(os.path.join(cycle_dir, f"{new_cid}.csv"), headers, copies)
+
+    with working_dir(root), quiet():
+        etl.generate_master_data_file_for_type(etl.STATES)
+        for cycle in cycles:
+            for data_type in PER_CANDIDATE_TYPES:
+                etl.generate_master_data_file_for_type(data_type, cycle=cycle)
+
+    return root
+
+
+def _relabel(row, cid, cycle):
+    row = dict(row)
+    if "cid" in row:
+        row["cid"] = cid
+    if "cycle" in row:
+        row["cycle"] = cycle
+    return row
+
+
+def _read_csv(file_path):
+    with open(file_path) as infile:
+        reader = csv.DictReader(infile)
+        return reader.fieldnames, list(reader)
+
+
+def _write_csv(file_path, headers, rows):
+    with open(file_path, "w") as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=headers)
+        writer.writeheader()
+        writer.writerows(rows)
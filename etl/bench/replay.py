@@ -0,0 +1,200 @@
+"""
+Deterministic replay of the multi day pull against the mock API, for tuning
+concurrency and retries without spending real calls. From the etl directory:
+
+    python -m bench.replay --concurrency 1 4 8 16 --latency 0.2 --jitter 0.1 \\
+        --not-found-rate 0.05 --empty-rate 0.02 --server-error-rate 0.02
+
+The mock enforces the daily limit the same way the API does and every
+simulated day starts with a fresh quota, so the report shows how many days a
+full pull takes, the wall time per day, and every status code the API saw.
+Faults come from --seed, so two runs with the same arguments see the same ones.
+
+    python -m bench.replay --roster-check
+
+checks that a second sync_roster goes back to the API and sees a party change
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+
+from server.data.paths import DEFAULT_CYCLE
+from api_cache import ApiCache
+from bench.corpus import working_dir
+from bench.stats import quiet
+from client import Client
+from data_puller import DataPuller
+from journal import PullJournal
+from mock_api import Faults, MockApi
+from quota import DAILY_CALL_LIMIT, QuotaScheduler
+
+# the real pull started here, the date only matters to the quota refills
+FIRST_DAY = date(2022, 11, 1)
+
+
+def replay_pull(
+    faults=None,
+    methods=None,
+    cycle=DEFAULT_CYCLE,
+    concurrency=8,
+    max_days=10,
+    backoff_factor=0.01,
+    quota_limit=None,
+    source_dir="./data",
+):
+    """
+    Pulls every method for every candidate in source_dir's state files into
+    an empty scratch dir, one simulated day at a time, until a day makes no
+    calls or max_days is up. Answers come from source_dir's seeds.
+
+    quota_limit is the daily limit the puller thinks it has, the mock's by
+    default. Set it higher to see how the puller copes with real 400s
+    """
+    faults = faults or Faults(daily_limit=DAILY_CALL_LIMIT)
+    source_root = os.path.dirname(os.path.abspath(source_dir))
+    scratch = tempfile.mkdtemp(prefix="replay_")
+    shutil.copytree(os.path.join(source_dir, "states"), os.path.join(scratch, "data", "states"))
+
+    today = [FIRST_DAY]
+    days = []
+    with working_dir(source_root):
+        mock = MockApi(faults=faults)
+
+    try:
+        with mock, working_dir(scratch), quiet():
+            quota = QuotaScheduler(daily_limit=quota_limit or faults.daily_limit or 10 ** 9, today=lambda: today[0])
+            cache = ApiCache()
+            client = Client(
+                api_key="replay",
+                base_url=mock.url,
+                quota=quota,
+                cache=cache,
+                backoff_factor=backoff_factor,
+                pool_size=concurrency,
+            )
+            puller = DataPuller(client=client, quota=quota, cache=cache, journal=PullJournal(), cycles=[cycle])
+
+            for day in range(1, max_days + 1):
+                mock.reset()
+                start = time.perf_counter()
+                puller.pull_data_for_all_methods(methods=methods, cycles=[cycle], concurrency=concurrency)
+                wall = time.perf_counter() - start
+
+                statuses = mock.status_counts()
+                if not statuses:
+                    break
+
+                days.append({
+                    "day": day,
+                    "wall_ms": round(1000 * wall, 3),
+                    "calls": sum(statuses.values()),
+                    "statuses": {f"{method} {status}": count for (method, status), count in sorted(statuses.items())},
+                })
+                today[0] += timedelta(days=1)
+
+            client.close()
+            pulled = {
+                method: len(os.listdir(f"./data/{method}/{cycle}/")) if os.path.isdir(f"./data/{method}/{cycle}/") else 0
+                for method in puller.method_map.keys()
+            }
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "concurrency": concurrency,
+        "days_needed": len(days),
+        "total_calls": sum(day["calls"] for day in days),
+        # with the quota in sync with the API this should always be 0
+        "call_limit_400s": sum(
+            count for day in days for key, count in day["statuses"].items() if key.endswith(" 400")
+        ),
+        "pulled": pulled,
+        "days": days,
+    }
+
+
+def check_roster_sync(state_code="NJ", source_dir="./data"):
+    """
+    Two sync_roster runs against the mock with a party change in between. The
+    second has to reach the API (the response cache keeps getLegislators for a
+    week) and report the change, raises AssertionError if it doesn't
+    """
+    source_root = os.path.dirname(os.path.abspath(source_dir))
+    scratch = tempfile.mkdtemp(prefix="roster_")
+    shutil.copytree(os.path.join(source_dir, "states"), os.path.join(scratch, "data", "states"))
+
+    with working_dir(source_root):
+        mock = MockApi()
+
+    try:
+        with mock, working_dir(scratch), quiet():
+            quota = QuotaScheduler(daily_limit=10 ** 9)
+            cache = ApiCache()
+            client = Client(api_key="replay", base_url=mock.url, quota=quota, cache=cache)
+            puller = DataPuller(client=client, quota=quota, cache=cache, journal=PullJournal(), cycles=[DEFAULT_CYCLE])
+
+            puller.sync_roster(states=[state_code])
+            row = mock.legislators[state_code][0]
+            old_party = row["party"]
+            row["party"] = "I" if old_party != "I" else "D"
+            diff = puller.sync_roster(states=[state_code])
+            client.close()
+            calls = sum(mock.status_counts().values())
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    assert calls == 2, f"expected both syncs to call getLegislators, got {calls} calls"
+    expected = {row["cid"]: {"party": (old_party, row["party"])}}
+    assert diff.changed == expected, f"expected {expected} changed, got {diff.changed}"
+
+    return {"state": state_code, "calls": calls, "changed": diff.changed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a full pull against the mock API")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--methods", nargs="+", default=None)
+    parser.add_argument("--cycle", default=DEFAULT_CYCLE)
+    parser.add_argument("--max-days", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--not-found-rate", type=float, default=0.0)
+    parser.add_argument("--empty-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--daily-limit", type=int, default=DAILY_CALL_LIMIT)
+    parser.add_argument("--quota-limit", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--roster-check", action="store_true")
+    args = parser.parse_args()
+
+    if args.roster_check:
+        print(json.dumps(check_roster_sync(), indent=2))
+        return
+
+    for concurrency in args.concurrency:
+        faults = Faults(
+            latency=args.latency,
+            jitter=args.jitter,
+            not_found_rate=args.not_found_rate,
+            empty_rate=args.empty_rate,
+            server_error_rate=args.server_error_rate,
+            daily_limit=args.daily_limit,
+            seed=args.seed,
+        )
+        report = replay_pull(
+            faults=faults,
+            methods=args.methods,
+            cycle=args.cycle,
+            concurrency=concurrency,
+            max_days=args.max_days,
+            quota_limit=args.quota_limit,
+        )
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
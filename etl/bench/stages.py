@@ -0,0 +1,199 @@
+import csv
+import importlib
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from server.data import etl
+from server.data.aggregate import aggregate, candidate_frame, load_frame
+from server.data.paths import seed_path
+from api_cache import ApiCache
+from bench.corpus import PER_CANDIDATE_TYPES, working_dir
+from bench.stats import measure, quiet, summarize
+from client import Client, ClientError
+from data_puller import DataPuller
+from journal import PullJournal
+from mock_api import MockApi
+from quota import QuotaScheduler
+
+# what the serve stage requests, roughly what the map page and typeahead do
+ROUTES = [
+    "/states",
+    "/states/NJ",
+    "/reps",
+    "/reps/{cid}",
+    "/map?topology=1",
+    "/rankings/contributors",
+    "/rankings/industries?state=CA&party=D",
+    "/search?q=cassidy",
+    "/search?q=casidy%20asoc",
+]
+
+
+def roster_cids():
+    with open(seed_path(etl.STATES)) as infile:
+        return [row["cid"] for row in csv.DictReader(infile)]
+
+
+def bench_fetch(root, cycles, calls=200, concurrency=8):
+    """
+    Client.fetch against the mock API, one call at a time and then
+    `concurrency` at once over the same pooled session
+    """
+    with working_dir(root), MockApi() as mock:
+        cids = roster_cids()[:calls]
+        with Client(api_key="bench", base_url=mock.url, max_retries=0, pool_size=concurrency) as client:
+
+            def fetch(cid):
+                try:
+                    client.get_candidate_total_by_sector(cid=cid, cycle=cycles[0])
+                except ClientError:
+                    # candidates with no data 404, same as the real thing
+                    pass
+
+            latencies = []
+            for cid in cids:
+                start = time.perf_counter()
+                fetch(cid)
+                latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(fetch, cids))
+            wall = time.perf_counter() - start
+
+    return {
+        "sequential": summarize(latencies, items=1),
+        "concurrent": {
+            "calls": len(cids),
+            "concurrency": concurrency,
+            "wall_ms": round(1000 * wall, 3),
+            "items_per_s": round(len(cids) / wall, 1),
+        },
+    }
+
+
+def bench_pull(root, cycles, method="sectors", concurrency=8):
+    """
+    A full concurrent pull of one method into an empty data dir, quota,
+    journal and response cache included, against the mock API
+    """
+    pull_root = os.path.join(root, "pull")
+    shutil.rmtree(pull_root, ignore_errors=True)
+    shutil.copytree(os.path.join(root, "data", "states"), os.path.join(pull_root, "data", "states"))
+
+    with working_dir(root), MockApi() as mock, working_dir(pull_root), quiet():
+        quota = QuotaScheduler(daily_limit=10 ** 9)
+        cache = ApiCache()
+        client = Client(api_key="bench", base_url=mock.url, max_retries=0, quota=quota, cache=cache)
+        puller = DataPuller(client=client, quota=quota, cache=cache, journal=PullJournal(), cycles=[cycles[0]])
+
+        start = time.perf_counter()
+        puller.pull_data_for_all_candidates_concurrently(method=method, cycle=cycles[0], concurrency=concurrency)
+        wall = time.perf_counter() - start
+        client.close()
+
+        pulled = len(os.listdir(f"./data/{method}/{cycles[0]}/"))
+
+    shutil.rmtree(pull_root, ignore_errors=True)
+    return {
+        "method": method,
+        "concurrency": concurrency,
+        "candidates": pulled,
+        "wall_ms": round(1000 * wall, 3),
+        "items_per_s": round(pulled / wall, 1),
+    }
+
+
+def bench_etl(root, cycles, repeat=3):
+    """
+    consolidate_records on its own (rows / s) and the whole seed build per type
+    """
+    results = {}
+    with working_dir(root), quiet():
+        for data_type in PER_CANDIDATE_TYPES + [etl.STATES]:
+            cycle = cycles[0]
+            rows = sum(1 for _ in etl.consolidate_records(data_type, cycle=cycle))
+            results[data_type] = {
+                "consolidate_records": measure(
+                    lambda: sum(1 for _ in etl.consolidate_records(data_type, cycle=cycle)),
+                    repeat=repeat,
+                    items=rows,
+                ),
+                "generate_seed": measure(
+                    lambda: etl.generate_master_data_file_for_type(data_type, cycle=cycle),
+                    repeat=repeat,
+                    items=rows,
+                    memory=False,
+                ),
+            }
+
+    return results
+
+
+def bench_aggregate(root, cycles, repeat=5):
+    with working_dir(root), quiet():
+        frame = load_frame(etl.INDUSTRIES, cycles)
+        return {
+            "candidate_frame": measure(lambda: candidate_frame(cycles[0]), repeat=repeat),
+            "sum_sectors_by_state": measure(lambda: etl.sum_sectors_by_state(cycles), repeat=repeat),
+            "load_frame_industries": measure(lambda: load_frame(etl.INDUSTRIES, cycles), repeat=repeat),
+            "industries_by_party_chamber_industry": measure(
+                lambda: aggregate(etl.INDUSTRIES, by=["party", "chamber", "industry"], frame=frame),
+                repeat=repeat,
+                items=len(frame),
+            ),
+        }
+
+
+def bench_serve(root, cycles, requests=200):
+    """
+    App startup (store, response cache, rankings, search) and per route latency
+    through Flask's test client, gzip accepted like a browser would
+    """
+    with working_dir(root), quiet():
+        startup = measure(_load_app, repeat=1, warmup=0)
+        app = sys.modules["main"].app
+        client = app.test_client()
+        cid = roster_cids()[0]
+
+        routes = {}
+        for route in ROUTES:
+            path = route.format(cid=cid)
+            latencies = []
+            etag = None
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.get(path, headers={"Accept-Encoding": "gzip"})
+                latencies.append(time.perf_counter() - start)
+                etag = response.headers.get("ETag")
+            routes[route] = summarize(latencies, items=1)
+
+            if etag is not None:
+                # a poller revalidating, should be a bodyless 304
+                latencies = []
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+                    latencies.append(time.perf_counter() - start)
+                routes[f"{route} (304)"] = summarize(latencies, items=1)
+
+    return {"startup": startup, "routes": routes}
+
+
+def _load_app():
+    # main builds everything at import, reload it so each corpus gets its own
+    if "main" in sys.modules:
+        return importlib.reload(sys.modules["main"])
+    return importlib.import_module("main")
+
+
+STAGES = {
+    "fetch": bench_fetch,
+    "pull": bench_pull,
+    "etl": bench_etl,
+    "aggregate": bench_aggregate,
+    "serve": bench_serve,
+}
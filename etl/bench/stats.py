@@ -0,0 +1,80 @@
+import contextlib
+import gc
+import math
+import os
+import time
+import tracemalloc
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(durations, items=None):
+    """
+    Latency stats in ms for a list of durations in seconds. items is how much
+    work one run did (rows, files, requests), for a throughput number
+    """
+    durations = sorted(durations)
+    total = sum(durations)
+    result = {
+        "runs": len(durations),
+        "mean_ms": round(1000 * total / len(durations), 3),
+        "p50_ms": round(1000 * percentile(durations, 0.50), 3),
+        "p90_ms": round(1000 * percentile(durations, 0.90), 3),
+        "p99_ms": round(1000 * percentile(durations, 0.99), 3),
+        "max_ms": round(1000 * durations[-1], 3),
+    }
+    if items is not None and total > 0:
+        result["items"] = items
+        result["items_per_s"] = round(items * len(durations) / total, 1)
+
+    return result
+
+
+def measure(fn, repeat=5, warmup=1, items=None, memory=True):
+    """
+    Times fn() `repeat` times after `warmup` untimed calls. Peak memory is
+    taken from one extra run under tracemalloc, so it doesn't slow down the
+    timed ones
+    """
+    for _ in range(warmup):
+        fn()
+
+    durations = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+
+    result = summarize(durations, items=items)
+    if memory:
+        result["peak_memory_kb"] = peak_memory_kb(fn)
+
+    return result
+
+
+def peak_memory_kb(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return round(peak / 1024, 1)
+
+
+@contextlib.contextmanager
+def quiet():
+    # the etl and puller print a line per file, which would swamp the timings
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
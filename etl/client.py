@@ -1,57 +1,174 @@
+import random
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlencode
 
+from server.metrics import metrics
+
+# transient server side failures, worth another try after backing off
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+
 class RateLimitError(Exception):
   def __init__(self, message):
     super().__init__(message)
 
 class ClientError(Exception):
-  def __init__(self, message):
+  def __init__(self, message, status_code=None):
     super().__init__(message)
+    self.status_code = status_code
 
 class Client(object):
-  def __init__(self, api_key=""):
+  def __init__(
+    self,
+    api_key="",
+    base_url="http://www.opensecrets.org/api/",
+    timeout=(3.05, 30),
+    max_retries=3,
+    backoff_factor=0.5,
+    max_backoff=10,
+    pool_size=10,
+    quota=None,
+    cache=None,
+    offline=False,
+    read_cache=True,
+  ):
+    """
+    timeout is (connect, read) seconds, same as requests takes it
+    base_url can be pointed at a local stub server for testing
+    quota is an optional QuotaScheduler, every request attempt takes one call from it
+    cache is an optional ApiCache of raw responses, checked before going to the API
+    offline=True only ever reads from the cache (expired entries included), for replays
+    read_cache=False still writes responses to the cache but always goes to the API
+    """
     self.api_key = api_key
-    self.BASE_URL = "http://www.opensecrets.org/api/?apikey={api_key}&method={method}&output=json&{params}"
+    self.quota = quota
+    self.cache = cache
+    self.offline = offline
+    self.read_cache = read_cache
+    self.BASE_URL = base_url + "?apikey={api_key}&method={method}&output=json&{params}"
+    self.timeout = timeout
+    self.max_retries = max_retries
+    self.backoff_factor = backoff_factor
+    self.max_backoff = max_backoff
+
+    # one pooled session for the life of the client so a multi day pull reuses
+    # keep-alive connections instead of doing a handshake on every call.
+    # Retries are handled in fetch, not by urllib3, so a rate limit is never retried
+    self.session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    self.session.mount("http://", adapter)
+    self.session.mount("https://", adapter)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+  def close(self):
+    self.session.close()
+
+  def fetch(self, method, read_cache=None, **kwargs):
+    """
+    read_cache overrides the client's own setting for just this call, so a refresh
+    can skip the cache without changing it for other pulls sharing the client
+    """
+    if read_cache is None:
+      read_cache = self.read_cache
 
-  def fetch(self, method, **kwargs):
     params = urlencode(kwargs)
     url = self.BASE_URL.format(api_key=self.api_key, method=method, params=params)
 
-    res = requests.get(url)
-    
-    if res.status_code == 400 and res.text == "call limit has been reached":
-      raise RateLimitError(res.text)
+    if self.cache is not None and (read_cache or self.offline):
+      cached = self.cache.get(method, kwargs, allow_expired=self.offline)
+      if cached is not None:
+        if metrics.enabled:
+          metrics.inc("api_cache_hits_total", method=method)
+        return cached
+
+    if self.offline:
+      raise ClientError(f"{method} {params} is not in the response cache")
+
+    attempt = 0
+    while True:
+      if self.quota is not None:
+        self.quota.acquire(method)
+
+      start = time.perf_counter()
+      try:
+        res = self.session.get(url, timeout=self.timeout)
+      except (requests.ConnectionError, requests.Timeout) as e:
+        if metrics.enabled:
+          metrics.observe("api_request_seconds", time.perf_counter() - start, method=method, status=type(e).__name__)
+        if attempt >= self.max_retries:
+          raise ClientError(f"{method} failed after {attempt + 1} attempts: {e}")
+        self._sleep_before_retry(attempt)
+        attempt += 1
+        continue
+
+      if metrics.enabled:
+        # one per attempt, retries and rate limits included
+        metrics.observe("api_request_seconds", time.perf_counter() - start, method=method, status=res.status_code)
+
+      if res.status_code == 400 and res.text == "call limit has been reached":
+        # no point retrying this one, the limit only resets the next day
+        if self.quota is not None:
+          self.quota.exhaust(method)
+        raise RateLimitError(res.text)
 
-    if res.status_code != 200:
-      raise ClientError(f"{res.content}")
+      if res.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+        self._sleep_before_retry(attempt, retry_after=res.headers.get("Retry-After"))
+        attempt += 1
+        continue
+
+      if res.status_code != 200:
+        raise ClientError(f"{res.content}", status_code=res.status_code)
+
+      response = res.json()["response"]
+      if self.cache is not None:
+        self.cache.put(method, kwargs, response)
+
+      return response
+
+  def _sleep_before_retry(self, attempt, retry_after=None):
+    """
+    Exponential backoff with jitter, capped at max_backoff
+    honors a numeric Retry-After header if the server sends one
+    """
+    if retry_after is not None and retry_after.isdigit():
+      delay = int(retry_after)
+    else:
+      delay = self.backoff_factor * (2 ** attempt)
+      delay = random.uniform(delay / 2, delay)
 
-    return res.json()["response"]
+    time.sleep(min(delay, self.max_backoff))
 
 
-  def get_legislators_for_state(self, state_code=""):
+  def get_legislators_for_state(self, state_code="", read_cache=None):
     """
     Fetch legislators by state
     https://www.opensecrets.org/api/?method=getLegislators&output=doc
     """
-    res = self.fetch("getLegislators", id=state_code)
+    res = self.fetch("getLegislators", read_cache=read_cache, id=state_code)
     
     # this is an array of legislators
     return res["legislator"]
 
   
-  def get_legislator_by_cid(self, cid=""):
+  def get_legislator_by_cid(self, cid="", read_cache=None):
     """
     Same endpoint, same parameter key, but different output format
     https://www.opensecrets.org/api/?method=getLegislators&output=doc
     """
-    res = self.fetch("getLegislators", id=cid)
+    res = self.fetch("getLegislators", read_cache=read_cache, id=cid)
     
     # this is a single legislator from the same endpoint
     return res["legislator"]
 
 
-  def get_candidate_summary(self, cid="", cycle=None):
+  def get_candidate_summary(self, cid="", cycle=None, read_cache=None):
     """
     Summary of fundraising information for candidate
     'cycle' is an even year, e.g. 2016, 2018, 2020
@@ -64,7 +181,7 @@ class Client(object):
     if cycle:
       kwargs["cycle"] = cycle
 
-    res = self.fetch("candSummary", **kwargs)
+    res = self.fetch("candSummary", read_cache=read_cache, **kwargs)
     """
     cand.json()["response"]["summary"]["@attributes"]
     Out[73]:
@@ -86,7 +203,7 @@ class Client(object):
     """
     return res["summary"]["@attributes"]
 
-  def get_candidate_contributors(self, cid="", cycle=None):
+  def get_candidate_contributors(self, cid="", cycle=None, read_cache=None):
     """
     Summary of candidate's top contributing organizations
     'cycle' is an even year, e.g. 2016, 2018, 2020
@@ -99,7 +216,7 @@ class Client(object):
     if cycle:
       kwargs["cycle"] = cycle
 
-    res = self.fetch("candContrib", **kwargs)
+    res = self.fetch("candContrib", read_cache=read_cache, **kwargs)
     # OpenSecrets docs claims this *must* be displayed with published data
     # candContrib.json()["response"]["contributors"]["@attributes"]["notice"]
     # candContrib.json()["response"]["contributors"]["@attributes"]["cycle"] # cycle for extra clarity
@@ -121,7 +238,7 @@ class Client(object):
       "contributors": contributors["contributor"],
     }
 
-  def get_candidate_top_ten_industries(self, cid="", cycle=""):
+  def get_candidate_top_ten_industries(self, cid="", cycle="", read_cache=None):
     """
     Top ten industries contributing to a given candidate
     cycle indicates even numbered election year
@@ -135,7 +252,7 @@ class Client(object):
     if cycle:
       kwargs["cycle"] = cycle
 
-    res = self.fetch("candIndustry", **kwargs)
+    res = self.fetch("candIndustry", read_cache=read_cache, **kwargs)
     # industries.json()["response"]["industries"]["@attributes"]["last_updated"]
     # industries.json()["response"]["industries"]["@attributes"]["cycle"]
     """
@@ -154,7 +271,7 @@ class Client(object):
       "cycle": industries["@attributes"]["cycle"],
     }
 
-  def get_candidate_total_by_sector(self, cid="", cycle=""):
+  def get_candidate_total_by_sector(self, cid="", cycle="", read_cache=None):
     """
     https://www.opensecrets.org/api/?method=candSector&output=doc
     """
@@ -163,7 +280,7 @@ class Client(object):
     if cycle:
       kwargs["cycle"] = cycle
 
-    res = self.fetch("candSector", **kwargs)
+    res = self.fetch("candSector", read_cache=read_cache, **kwargs)
     """
     # sectors.json()["response"]["sectors"]["@attributes"]["last_updated"]
     # sectors.json()["response"]["sectors"]["@attributes"]["cycle"]
@@ -1,15 +1,8 @@
 from .api_key import API_KEY  # this will have to be removed when you want to actually deploy this
-from .failed_cids import FAILED_CIDS
-from .failed_industry_cids import FAILED_INDUSTRY_CIDS
-from .failed_sector_cids import FAILED_SECTOR_CIDS
-from .failed_contributor_cids import FAILED_CONTRIBUTOR_CIDS
-from .states import STATE_ABBREV_MAP
+from .states import STATE_ABBREV_MAP, STATE_FIPS_MAP
 
 __all__ = [
   "API_KEY",
-  "FAILED_CIDS",
-  "FAILED_CONTRIBUTOR_CIDS",
-  "FAILED_INDUSTRY_CIDS",
-  "FAILED_SECTOR_CIDS",
   "STATE_ABBREV_MAP",
+  "STATE_FIPS_MAP",
   ]
@@ -1,2 +0,0 @@
-FAILED_CIDS = [
-]
@@ -1,7 +0,0 @@
-FAILED_CONTRIBUTOR_CIDS = [
-    'N00027695',
-    'N00051961',
-    'N00027695',
-    'N00051961',
-    'N00052615',
-]
@@ -1,5 +0,0 @@
-FAILED_INDUSTRY_CIDS = [
-    'N00027695',
-    'N00051961',
-    'N00052615',
-]
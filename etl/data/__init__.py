@@ -1,7 +1,20 @@
-from .cid_state_map import CID_STATE_MAP
-from .state_sector_totals import STATE_SECTOR_TOTALS
-
+# CID_STATE_MAP and STATE_SECTOR_TOTALS are built from the seeds by
+# artifacts.build_lookup_artifacts, and only loaded the first time
+# something asks for them rather than at import
 __all__ = [
     "CID_STATE_MAP",
     "STATE_SECTOR_TOTALS",
 ]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from .artifacts import load_lookup_artifacts
+
+    lookups = load_lookup_artifacts()
+    for key in __all__:
+        globals()[key] = lookups[key]
+
+    return lookups[name]
@@ -0,0 +1,101 @@
+import pandas as pd
+
+from server.data.columnar import read_seed_frame
+from server.data.paths import DEFAULT_CYCLE
+
+# what you can group by, mapped to the seed column it comes from
+DIMENSIONS = {
+    "cid": "cid",
+    "state": "state",
+    "party": "party",
+    "chamber": "chamber",
+    "cycle": "cycle",
+    "sector": "sector_name",
+    "industry": "industry_name",
+    "contributor": "org_name",
+}
+
+MEASURES = {
+    "contributors": ["indivs", "pacs", "total"],
+    "industries": ["indivs", "pacs", "total"],
+    "sectors": ["indivs", "pacs", "total"],
+    "summaries": ["total", "spent", "cash_on_hand", "debt"],
+}
+
+# per cycle candidate attributes, taken from that cycle's summaries so a rep
+# who moved chambers or states is counted where they were at the time
+CANDIDATE_COLUMNS = ["cid", "state", "party", "chamber"]
+
+
+def candidate_frame(cycle=DEFAULT_CYCLE):
+    """
+    cid -> state / party / chamber for a cycle. Summaries for first term reps
+    come back with a blank state and chamber, those get filled in from the roster
+    """
+    summaries = read_seed_frame("summaries", cycle, columns=CANDIDATE_COLUMNS)
+    summaries = summaries.drop_duplicates("cid").set_index("cid").replace("", pd.NA)
+
+    roster = read_seed_frame("states", columns=["cid", "state", "party", "office"])
+    roster = roster.drop_duplicates("cid").set_index("cid")
+    # office is e.g. NJ01 for a house seat, NJS1 for the senate
+    roster["chamber"] = roster["office"].str[2].eq("S").map({True: "S", False: "H"})
+
+    return summaries.combine_first(roster[CANDIDATE_COLUMNS[1:]]).reset_index()
+
+
+def load_frame(data_type="", cycles=None):
+    """
+    One frame for the given cycles with the candidate's state / party / chamber
+    joined onto every row. Only the requested cycles' seeds get read
+    """
+    frames = []
+    for cycle in cycles or [DEFAULT_CYCLE]:
+        frame = read_seed_frame(data_type, cycle)
+        # summaries have their own (sometimes blank) copies of these, use the filled in ones
+        frame = frame.drop(columns=[column for column in CANDIDATE_COLUMNS[1:] if column in frame.columns])
+        frame = frame.merge(candidate_frame(cycle), on="cid", how="left")
+        # summaries store cycle as text, everything else as an int
+        frame["cycle"] = str(cycle)
+        frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def aggregate(data_type="sectors", by=("state",), cycles=None, measures=None, frame=None):
+    """
+    Sums the measures grouped by any combination of DIMENSIONS in one vectorized
+    pass, e.g. aggregate("industries", by=["party", "chamber", "industry"]).
+    Pass in a frame from load_frame to run several aggregations off one load
+    """
+    if measures is None:
+        measures = MEASURES[data_type]
+
+    for dimension in by:
+        if dimension not in DIMENSIONS:
+            raise NotImplementedError(f"Cannot group by {dimension}")
+
+    if frame is None:
+        frame = load_frame(data_type, cycles)
+
+    columns = [DIMENSIONS[dimension] for dimension in by]
+    # nullable ints would come back as object dtype from the sum, keep them numeric
+    values = frame[columns + list(measures)].astype({measure: "float64" for measure in measures})
+
+    return values.groupby(columns, sort=True, dropna=False)[list(measures)].sum()
+
+
+def aggregate_to_dict(data_type="sectors", by=("state",), cycles=None, measures=None, frame=None):
+    """
+    Same as aggregate but as plain python for json, keyed by the group value
+    (a tuple of them when grouping by more than one dimension)
+    """
+    result = aggregate(data_type, by=by, cycles=cycles, measures=measures, frame=frame)
+    as_int = data_type != "summaries"
+
+    return {
+        key: {
+            measure: int(value) if as_int else round(float(value), 2)
+            for measure, value in row.items()
+        }
+        for key, row in result.to_dict(orient="index").items()
+    }
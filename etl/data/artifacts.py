@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+
+from server.data import etl
+from server.data.paths import DEFAULT_CYCLE, seed_path
+from server.data.roster_index import roster_index
+
+ARTIFACT_DIR = "./data/artifacts/"
+
+
+def artifact_path(cycle=DEFAULT_CYCLE):
+    return f"{ARTIFACT_DIR}lookups_{cycle}.json"
+
+
+def source_seed_paths(cycle=DEFAULT_CYCLE):
+    # everything the lookups are computed from, if any of these change they're stale
+    return [
+        seed_path(etl.STATES),
+        seed_path(etl.SUMMARIES, cycle),
+        seed_path(etl.SECTORS, cycle),
+    ]
+
+
+def source_checksum(cycle=DEFAULT_CYCLE):
+    digest = hashlib.sha256()
+    # CID_STATE_MAP falls back to the roster for anyone the summaries leave out
+    digest.update(roster_index().checksum().encode("utf-8"))
+    for file_path in source_seed_paths(cycle):
+        with open(file_path, "rb") as infile:
+            digest.update(infile.read())
+
+    return digest.hexdigest()
+
+
+def build_lookup_artifacts(cycle=DEFAULT_CYCLE):
+    """
+    Build step for the lookup tables that used to be pasted into
+    cid_state_map.py / state_sector_totals.py. Writes them to one json file
+    along with a checksum of the seeds they came from
+    """
+    lookups = {
+        "cycle": cycle,
+        "checksum": source_checksum(cycle),
+        "CID_STATE_MAP": etl.create_cid_state_map(cycle),
+        "STATE_SECTOR_TOTALS": etl.sum_sectors_by_state([cycle]),
+    }
+
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    file_path = artifact_path(cycle)
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w") as outfile:
+        json.dump(lookups, outfile, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, file_path)
+
+    print(f"Saved lookup tables to {file_path}")
+    return lookups
+
+
+def load_lookup_artifacts(cycle=DEFAULT_CYCLE):
+    """
+    Loads the lookup tables, rebuilding them first if they're missing or the
+    seeds have changed since they were built
+    """
+    try:
+        with open(artifact_path(cycle)) as infile:
+            lookups = json.load(infile)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return build_lookup_artifacts(cycle)
+
+    if lookups["checksum"] != source_checksum(cycle):
+        print(f"Seeds changed since {artifact_path(cycle)} was built, rebuilding")
+        return build_lookup_artifacts(cycle)
+
+    return lookups
@@ -1,550 +0,0 @@
-CID_STATE_MAP = {
-    "N00030910": "AL",
-    "N00000179": "MA",
-    "N00012233": "OH",
-    "N00044908": "NY",
-    "N00041870": "PA",
-    "N00026627": "NC",
-    "N00043242": "PA",
-    "N00005559": "OK",
-    "N00034784": "IL",
-    "N00029070": "CT",
-    "N00031005": "MO",
-    "N00036018": "VA",
-    "N00045974": "CO",
-    "N00029662": "FL",
-    "N00026790": "MO",
-    "N00048049": "TX",
-    "N00035934": "NY",
-    "N00033410": "OK",
-    "N00027459": "CA",
-    "N00003288": "MS",
-    "N00000781": "NJ",
-    "N00030642": "FL",
-    "N00033363": "AR",
-    "N00026961": "NY",
-    "N00032243": "GA",
-    "N00029139": "IL",
-    "N00035504": "WY",
-    "N00042808": "FL",
-    "N00033997": "CA",
-    "N00033983": "AZ",
-    "N00027060": "NY",
-    "N00037515": "AZ",
-    "N00042161": "NH",
-    "N00042149": "MI",
-    "N00041454": "NM",
-    "N00041871": "PA",
-    "N00036409": "WI",
-    "N00046688": "TN",
-    "N00027510": "CO",
-    "N00003473": "KY",
-    "N00038397": "NH",
-    "N00041668": "ME",
-    "N00035670": "SC",
-    "N00036351": "NY",
-    "N00041873": "TN",
-    "N00002221": "NC",
-    "N00026368": "MI",
-    "N00047972": "LA",
-    "N00008122": "TX",
-    "N00004724": "IL",
-    "N00033177": "VA",
-    "N00029649": "CA",
-    "N00029891": "VA",
-    "N00027894": "OH",
-    "N00036999": "MD",
-    "N00029675": "KY",
-    "N00027658": "NY",
-    "N00046067": "TX",
-    "N00001489": "PA",
-    "N00009771": "WV",
-    "N00009759": "WA",
-    "N00038779": "PA",
-    "N00033638": "NV",
-    "N00026427": "CA",
-    "N00030245": "LA",
-    "N00026341": "CA",
-    "N00046489": "GA",
-    "N00007364": "CA",
-    "N00026631": "NE",
-    "N00034547": "NY",
-    "N00007833": "WA",
-    "N00030709": "CA",
-    "N00028152": "CA",
-    "N00000153": "MA",
-    "N00045369": "TN",
-    "N00044701": "GA",
-    "N00034580": "ME",
-    "N00029260": "AZ",
-    "N00027503": "PA",
-    "N00004133": "MI",
-    "N00041335": "ID",
-    "N00007360": "CA",
-    "N00039503": "FL",
-    "N00045812": "UT",
-    "N00031177": "NV",
-    "N00037260": "CA",
-    "N00030490": "OH",
-    "N00035517": "MT",
-    "N00006863": "CA",
-    "N00000751": "NJ",
-    "N00041731": "IN",
-    "N00045557": "VA",
-    "N00041080": "CO",
-    "N00027462": "FL",
-    "N00039106": "LA",
-    "N00030650": "FL",
-    "N00007017": "CA",
-    "N00044884": "MI",
-    "N00035927": "NY",
-    "N00002147": "VA",
-    "N00030693": "WA",
-    "N00001102": "NY",
-    "N00033832": "SC",
-    "N00032457": "GA",
-    "N00008046": "CA",
-    "N00007836": "WA",
-    "N00029513": "IN",
-    "N00042403": "FL",
-    "N00024790": "NH",
-    "N00045434": "WI",
-    "N00041134": "MN",
-    "N00013855": "MA",
-    "N00037049": "NE",
-    "N00029277": "MI",
-    "N00033549": "WI",
-    "N00027514": "FL",
-    "N00027500": "MN",
-    "N00003105": "TN",
-    "N00042159": "NC",
-    "N00004118": "MI",
-    "N00033987": "CA",
-    "N00043290": "FL",
-    "N00038781": "PA",
-    "N00006690": "CA",
-    "N00038742": "NY",
-    "N00041295": "AL",
-    "N00030875": "NH",
-    "N00029303": "OR",
-    "N00033373": "CA",
-    "N00033367": "CA",
-    "N00029459": "VA",
-    "N00005818": "TX",
-    "N00031559": "WA",
-    "N00035267": "NJ",
-    "N00002408": "SC",
-    "N00006134": "CO",
-    "N00035307": "PA",
-    "N00044298": "CA",
-    "N00003689": "OH",
-    "N00036154": "NJ",
-    "N00025882": "HI",
-    "N00044501": "CA",
-    "N00031820": "DE",
-    "N00042164": "NJ",
-    "N00041690": "OH",
-    "N00045421": "TX",
-    "N00040559": "SD",
-    "N00044065": "PA",
-    "N00041620": "MO",
-    "N00028133": "CO",
-    "N00027566": "CT",
-    "N00034254": "CA",
-    "N00030026": "MO",
-    "N00030581": "IL",
-    "N00040933": "NM",
-    "N00041542": "WV",
-    "N00045730": "MI",
-    "N00031933": "MA",
-    "N00040853": "CA",
-    "N00030191": "NV",
-    "N00030608": "CO",
-    "N00034453": "WA",
-    "N00007099": "CA",
-    "N00029416": "PA",
-    "N00046760": "FL",
-    "N00030184": "LA",
-    "N00032546": "WI",
-    "N00000286": "UT",
-    "N00041594": "TN",
-    "N00035215": "IL",
-    "N00027605": "MT",
-    "N00040675": "GA",
-    "N00040891": "IL",
-    "N00026335": "FL",
-    "N00042894": "PA",
-    "N00029562": "NM",
-    "N00033274": "CA",
-    "N00026686": "TX",
-    "N00042458": "MS",
-    "N00033510": "CA",
-    "N00029574": "OH",
-    "N00030743": "KS",
-    "N00002097": "VA",
-    "N00003389": "KY",
-    "N00044559": "NM",
-    "N00042114": "IL",
-    "N00031688": "ND",
-    "N00034041": "KY",
-    "N00001171": "NY",
-    "N00042706": "PA",
-    "N00041569": "IL",
-    "N00003028": "AL",
-    "N00047871": "NM",
-    "N00001373": "PA",
-    "N00026914": "WI",
-    "N00024871": "GA",
-    "N00005883": "TX",
-    "N00033316": "TX",
-    "N00009920": "AL",
-    "N00030622": "AL",
-    "N00000939": "NY",
-    "N00024870": "CA",
-    "N00000078": "NY",
-    "N00034120": "PA",
-    "N00033101": "IL",
-    "N00042868": "ND",
-    "N00034068": "MI",
-    "N00029788": "WY",
-    "N00037039": "MN",
-    "N00033539": "TX",
-    "N00038450": "PA",
-    "N00012508": "DE",
-    "N00035825": "CA",
-    "N00032838": "WV",
-    "N00030949": "NY",
-    "N00041154": "NJ",
-    "N00030752": "SC",
-    "N00037015": "CA",
-    "N00041418": "VA",
-    "N00044206": "CO",
-    "N00040712": "KS",
-    "N00001799": "MD",
-    "N00036135": "LA",
-    "N00001955": "MD",
-    "N00031128": "OH",
-    "N00025175": "OH",
-    "N00043421": "CT",
-    "N00001821": "MD",
-    "N00045905": "IN",
-    "N00030829": "CO",
-    "N00030815": "TN",
-    "N00038285": "TX",
-    "N00026050": "AK",
-    "N00033449": "FL",
-    "N00032019": "RI",
-    "N00037161": "NV",
-    "N00041791": "GA",
-    "N00033474": "OR",
-    "N00009918": "VT",
-    "N00029404": "NY",
-    "N00030196": "NY",
-    "N00025766": "LA",
-    "N00047875": "OH",
-    "N00039373": "MO",
-    "N00036915": "CA",
-    "N00029835": "NM",
-    "N00036097": "AZ",
-    "N00040667": "CA",
-    "N00031129": "OK",
-    "N00041357": "MI",
-    "N00038858": "WA",
-    "N00044575": "NY",
-    "N00031317": "FL",
-    "N00039777": "FL",
-    "N00013820": "MD",
-    "N00044011": "IA",
-    "N00006236": "WY",
-    "N00044007": "HI",
-    "N00041194": "TX",
-    "N00043581": "MN",
-    "N00007248": "CA",
-    "N00041221": "UT",
-    "N00047888": "CA",
-    "N00033106": "MO",
-    "N00045251": "MN",
-    "N00033310": "OH",
-    "N00035007": "OH",
-    "N00035774": "AK",
-    "N00041750": "AZ",
-    "N00050649": "MN",
-    "N00046598": "UT",
-    "N00038734": "NV",
-    "N00043379": "WI",
-    "N00042715": "SC",
-    "N00000491": "ME",
-    "N00042649": "MI",
-    "N00001758": "IA",
-    "N00033932": "UT",
-    "N00006023": "TX",
-    "N00031857": "AR",
-    "N00037003": "MS",
-    "N00039953": "LA",
-    "N00009660": "LA",
-    "N00047264": "TX",
-    "N00033240": "IL",
-    "N00031696": "UT",
-    "N00002260": "NC",
-    "N00027751": "MD",
-    "N00005282": "KS",
-    "N00004981": "IL",
-    "N00042056": "AZ",
-    "N00040133": "FL",
-    "N00037422": "FL",
-    "N00042081": "CA",
-    "N00042268": "TX",
-    "N00035792": "AR",
-    "N00037185": "IN",
-    "N00042240": "TX",
-    "N00042282": "TX",
-    "N00025219": "TX",
-    "N00042296": "VA",
-    "N00030600": "CA",
-    "N00038260": "KY",
-    "N00028073": "KY",
-    "N00004572": "SD",
-    "N00009724": "RI",
-    "N00045506": "MA",
-    "N00024852": "TX",
-    "N00029147": "MD",
-    "N00000270": "MA",
-    "N00026314": "WA",
-    "N00036107": "CA",
-    "N00041370": "NJ",
-    "N00033527": "NC",
-    "N00037031": "IL",
-    "N00037019": "CA",
-    "N00028139": "HI",
-    "N00031681": "WV",
-    "N00008799": "TX",
-    "N00000528": "VT",
-    "N00034128": "PA",
-    "N00027626": "FL",
-    "N00040865": "CA",
-    "N00035544": "NE",
-    "N00033492": "MA",
-    "N00042243": "TX",
-    "N00032029": "VA",
-    "N00030602": "TX",
-    "N00046030": "NY",
-    "N00048747": "NY",
-    "N00000515": "VT",
-    "N00044592": "TX",
-    "N00039551": "NC",
-    "N00035431": "MA",
-    "N00027035": "NC",
-    "N00033054": "MT",
-    "N00006789": "CA",
-    "N00044223": "AZ",
-    "N00044579": "OK",
-    "N00028138": "HI",
-    "N00044790": "NY",
-    "N00034277": "NY",
-    "N00041165": "NY",
-    "N00004367": "WI",
-    "N00045307": "WI",
-    "N00033508": "CA",
-    "N00037034": "KS",
-    "N00041808": "MA",
-    "N00035347": "GA",
-    "N00031647": "PA",
-    "N00045703": "IL",
-    "N00027623": "NE",
-    "N00041997": "PA",
-    "N00041954": "IN",
-    "N00005681": "TX",
-    "N00030612": "FL",
-    "N00002893": "FL",
-    "N00007727": "OR",
-    "N00044346": "NY",
-    "N00044434": "AL",
-    "N00048568": "OH",
-    "N00040915": "MI",
-    "N00035346": "GA",
-    "N00035420": "IL",
-    "N00026460": "TX",
-    "N00046394": "FL",
-    "N00043207": "NY",
-    "N00031685": "CT",
-    "N00044232": "KS",
-    "N00007479": "CA",
-    "N00033904": "OH",
-    "N00000699": "NJ",
-    "N00005736": "TX",
-    "N00035187": "SD",
-    "N00041606": "WA",
-    "N00030957": "TN",
-    "N00041162": "NY",
-    "N00030770": "AR",
-    "N00013817": "ME",
-    "N00007876": "WA",
-    "N00026106": "FL",
-    "N00031877": "CA",
-    "N00004614": "ND",
-    "N00007335": "CA",
-    "N00027783": "SC",
-    "N00041599": "TN",
-    "N00041002": "VA",
-    "N00024842": "CT",
-    "N00003225": "TN",
-    "N00036275": "MI",
-    "N00033443": "NE",
-    "N00041956": "IN",
-    "N00042293": "VA",
-    "N00002884": "FL",
-    "N00007724": "OR",
-    "N00030836": "KY",
-    "N00026926": "CA",
-    "N00002674": "GA",
-    "N00033640": "NY",
-    "N00040876": "CO",
-    "N00033720": "GA",
-    "N00033085": "TX",
-    "N00037036": "MD",
-    "N00030771": "AZ",
-    "N00044027": "NC",
-    "N00004403": "WI",
-    "N00035691": "AL",
-    "N00025482": "MD",
-    "N00041104": "IA",
-    "N00006267": "ID",
-    "N00024978": "TX",
-    "N00046125": "GA",
-    "N00044040": "NY",
-    "N00026148": "TX",
-    "N00040597": "CA",
-    "N00038809": "TX",
-    "N00001093": "NY",
-    "N00037247": "NV",
-    "N00036944": "NJ",
-    "N00033814": "WV",
-    "N00041702": "TX",
-    "N00025284": "AZ",
-    "N00042237": "TX",
-    "N00031226": "IN",
-    "N00009975": "SC",
-    "N00003280": "MS",
-    "N00029441": "ID",
-    "N00030676": "MO",
-    "N00031233": "KY",
-    "N00007781": "OR",
-    "N00031227": "IN",
-    "N00038565": "NC",
-    "N00006460": "AZ",
-    "N00033395": "MI",
-    "N00038767": "OH",
-    "N00000575": "CT",
-    "N00027860": "IL",
-    "N00046252": "NC",
-    "N00045773": "OR",
-    "N00027848": "GA",
-    "N00031958": "MS",
-    "N00029736": "PA",
-    "N00036158": "NJ",
-    "N00035451": "NC",
-    "N00042626": "KS",
-    "N00035492": "NC",
-    "N00043504": "FL",
-    "N00030717": "CA",
-    "N00030071": "OR",
-    "N00045377": "CA",
-    "N00031390": "MN",
-    "N00033591": "CA",
-    "N00046654": "GA",
-    "N00000615": "CT",
-    "N00027533": "RI",
-    "N00009816": "NJ",
-    "N00040741": "NY",
-    "N00039533": "MI",
-    "N00031782": "SC",
-    "N00035282": "MO",
-    "N00044335": "NC",
-    "N00037442": "FL",
-    "N00035527": "AR",
-    "N00034639": "NJ",
-    "N00033630": "NC",
-    "N00029495": "IA",
-    "N00034349": "TX",
-    "N00039122": "MD",
-    "N00005195": "MO",
-    "N00032088": "OH",
-    "N00007999": "AK",
-    "N00009585": "CA",
-    "N00046537": "IN",
-    "N00034016": "FL",
-    "N00042194": "OH",
-    "N00006701": "CA",
-    "N00041338": "IL",
-    "N00013873": "AR",
-    "N00036403": "WA",
-    "N00002942": "FL",
-    "N00026823": "LA",
-    "N00041843": "NJ",
-    "N00026166": "NC",
-    "N00042386": "CA",
-    "N00024759": "AL",
-    "N00039293": "AZ",
-    "N00004884": "IL",
-    "N00037269": "FL",
-    "N00003682": "OH",
-    "N00006671": "CA",
-    "N00039330": "WI",
-    "N00035278": "MA",
-    "N00047361": "GA",
-    "N00030670": "IN",
-    "N00042581": "MA",
-    "N00003522": "OH",
-    "N00030856": "CA",
-    "N00042224": "TX",
-    "N00035523": "NY",
-    "N00025095": "TX",
-    "N00042813": "GA",
-    "N00038601": "CA",
-    "N00012942": "MN",
-    "N00027709": "TX",
-    "N00045167": "TX",
-    "N00003132": "TN",
-    "N00040989": "TX",
-    "N00046320": "WA",
-    "N00044245": "AL",
-    "N00027523": "NJ",
-    "N00039090": "GA",
-    "N00038429": "IN",
-    "N00034549": "NY",
-    "N00044521": "IA",
-    "N00004887": "IL",
-    "N00013323": "MO",
-    "N00033030": "CA",
-    "N00005582": "OK",
-    "N00041511": "MN",
-    "N00033839": "TX",
-    "N00039327": "VA",
-    "N00045978": "FL",
-    "N00025726": "OK",
-    "N00024809": "SC",
-    "N00030667": "IL",
-    "N00030673": "MI",
-    "N00007021": "CA",
-    "N00025280": "OH",
-    "N00003535": "OH",
-    "N00033390": "IL",
-    "N00046055": "TX",
-    "N00040829": "OK",
-    "N00006897": "CA",
-    "N00035440": "MN",
-    "N00042810": "FL",
-    "N00036149": "MI",
-    "N00040949": "PA",
-    "N00043298": "MS",
-    "N00035483": "IA",
-    "N00000362": "RI",
-    "N00007419": "CA",
-    "N00025337": "FL",
-    "N00038414": "DE",
-    "N00025445": "TN",
-    "N00050780": "AK",
-    "N00042353": "MN",
-    "N00041882": "TX",
-    "N00006263": "ID",
-}
@@ -0,0 +1,178 @@
+import os
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from server.data.paths import DEFAULT_CYCLE, seed_path
+
+# Column types for each seed, matching the tables in ../schema/*.sql.
+# Integers are nullable since a few source rows have blanks. Dates list every
+# format that shows up in the data, | separated, the first is the one written out
+SEED_DTYPES = {
+    "contributors": {
+        "org_name": "string",
+        "total": "Int64",
+        "pacs": "Int64",
+        "indivs": "Int64",
+        "cycle": "Int64",
+        "source": "string",
+        "cid": "string",
+    },
+    "industries": {
+        "industry_code": "string",
+        "industry_name": "string",
+        "indivs": "Int64",
+        "pacs": "Int64",
+        "total": "Int64",
+        "last_updated": "date:%m/%d/%Y",
+        "cycle": "Int64",
+        "cid": "string",
+    },
+    "sectors": {
+        "sector_name": "string",
+        "sectorid": "string",
+        "indivs": "Int64",
+        "pacs": "Int64",
+        "total": "Int64",
+        "last_updated": "date:%m/%d/%Y",
+        "cycle": "Int64",
+        "cid": "string",
+    },
+    "states": {
+        "cid": "string",
+        "firstlast": "string",
+        "lastname": "string",
+        "party": "string",
+        "office": "string",
+        "gender": "string",
+        "first_elected": "Int64",
+        "phone": "string",
+        "website": "string",
+        "congress_office": "string",
+        "twitter_id": "string",
+        "youtube_url": "string",
+        "facebook_id": "string",
+        # the API sends 1958-12-13, older state files and seeds have 12/13/58
+        "birthdate": "date:%Y-%m-%d|%m/%d/%y|%m/%d/%Y",
+        "state": "string",
+    },
+    "summaries": {
+        "cand_name": "string",
+        "cid": "string",
+        "cycle": "string",
+        "state": "string",
+        "party": "string",
+        "chamber": "string",
+        "first_elected": "Int64",
+        "next_election": "Int64",
+        # these have cents, the old schema choked on them as integers
+        "total": "float64",
+        "spent": "float64",
+        "cash_on_hand": "float64",
+        "debt": "float64",
+        "origin": "string",
+        "source": "string",
+        "last_updated": "date:%m/%d/%Y",
+    },
+}
+
+
+def arrow_seed_path(data_type="", cycle=DEFAULT_CYCLE):
+    return seed_path(data_type, cycle)[: -len(".csv")] + ".arrow"
+
+
+def write_arrow_seed(data_type="", cycle=DEFAULT_CYCLE):
+    """
+    Writes a typed Arrow IPC (feather v2) copy of a CSV seed next to it.
+    Uncompressed on purpose so readers can memory map it
+    """
+    frame = _read_typed_csv(data_type, cycle)
+    file_path = arrow_seed_path(data_type, cycle)
+    tmp_path = f"{file_path}.tmp"
+    feather.write_feather(frame, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, file_path)
+
+    print(f"Saved {len(frame)} typed records to {file_path}")
+
+
+def read_seed_table(data_type="", cycle=DEFAULT_CYCLE, columns=None):
+    """
+    Memory maps the Arrow seed, nothing gets parsed and only the columns you
+    touch get paged in. Builds it from the CSV first if it's missing or older
+    """
+    file_path = arrow_seed_path(data_type, cycle)
+    csv_path = seed_path(data_type, cycle)
+    if not os.path.exists(file_path) or os.path.getmtime(file_path) < os.path.getmtime(csv_path):
+        write_arrow_seed(data_type, cycle)
+
+    return feather.read_table(file_path, columns=columns, memory_map=True)
+
+
+def read_seed_frame(data_type="", cycle=DEFAULT_CYCLE, columns=None):
+    return read_seed_table(data_type, cycle, columns=columns).to_pandas()
+
+
+def date_formats(dtype):
+    return dtype[len("date:"):].split("|")
+
+
+def parse_date(value, formats):
+    """
+    The one date parser for the seeds, records.py uses it too. Tries each
+    format in turn and raises ValueError if none of them fit
+    """
+    for date_format in formats:
+        try:
+            parsed = datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+
+        if "%y" in date_format and parsed > date.today():
+            # two digit years, a birthdate of 1/1/45 is 1945 not 2045
+            parsed = parsed.replace(year=parsed.year - 100)
+        return parsed
+
+    raise ValueError(f"{value!r} doesn't match any of {formats}")
+
+
+def _read_typed_csv(data_type, cycle):
+    dtypes = SEED_DTYPES[data_type]
+    file_path = seed_path(data_type, cycle)
+    frame = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    frame = frame[[column for column in dtypes.keys() if column in frame.columns]]
+
+    for column in frame.columns:
+        dtype = dtypes[column]
+        if dtype == "string":
+            frame[column] = frame[column].astype("string")
+            continue
+
+        present = (frame[column] != "").sum()
+        if dtype.startswith("date:"):
+            frame[column] = _parse_date_column(frame[column], date_formats(dtype), f"{file_path} {column}")
+        elif dtype == "Int64":
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").astype("Int64")
+        else:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce").astype(dtype)
+
+        # blanks are the only thing allowed to become null
+        if frame[column].notna().sum() != present:
+            raise ValueError(
+                f"{file_path} {column}: {present} values in the csv but {frame[column].notna().sum()} after typing"
+            )
+
+    return frame
+
+
+def _parse_date_column(values, formats, label):
+    # a few hundred distinct dates at most, parse each one once
+    parsed = {}
+    for value in values.unique():
+        if value:
+            try:
+                parsed[value] = parse_date(value, formats)
+            except ValueError as e:
+                raise ValueError(f"{label}: {e}") from None
+
+    return pd.to_datetime(values.map(parsed))
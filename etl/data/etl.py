@@ -1,6 +1,15 @@
 import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from server.data import records
+from server.data.aggregate import aggregate_to_dict
+from server.data.columnar import read_seed_frame, write_arrow_seed
+from server.data.paths import DEFAULT_CYCLE, cycle_dir, seed_path
+from server.data.roster_index import roster_index, state_for_office
 from server.data.utils import list_files_in_dir
-from server.data.cid_state_map import CID_STATE_MAP
+from server.metrics import metrics
 from server.constants.states import STATE_ABBREV_MAP
 
 INDUSTRIES = "industries"
@@ -9,103 +18,207 @@ STATES = "states"
 SUMMARIES = "summaries"
 CONTRIBUTORS = "contributors"
 
-def generate_master_data_file_for_type(data_type=""):
-  if data_type not in [
-    CONTRIBUTORS,
-    INDUSTRIES,
-    SECTORS,
-    STATES,
-    SUMMARIES,
-  ]:
+DATA_TYPES = [CONTRIBUTORS, INDUSTRIES, SECTORS, STATES, SUMMARIES]
+
+# Column order of each seed file, matching the tables in ../schema/*.sql.
+# Anything else a source file has (the state files have a lot) gets dropped
+SEED_HEADERS = {
+  CONTRIBUTORS: ["org_name", "total", "pacs", "indivs", "cycle", "source", "cid"],
+  INDUSTRIES: ["industry_code", "industry_name", "indivs", "pacs", "total", "last_updated", "cycle", "cid"],
+  SECTORS: ["sector_name", "sectorid", "indivs", "pacs", "total", "last_updated", "cycle", "cid"],
+  STATES: [
+    "cid", "firstlast", "lastname", "party", "office", "gender", "first_elected", "phone", "website",
+    "congress_office", "twitter_id", "youtube_url", "facebook_id", "birthdate", "state",
+  ],
+  SUMMARIES: [
+    "cand_name", "cid", "cycle", "state", "party", "chamber", "first_elected", "next_election",
+    "total", "spent", "cash_on_hand", "debt", "origin", "source", "last_updated",
+  ],
+}
+
+def generate_master_data_file_for_type(data_type="", cycle=DEFAULT_CYCLE):
+  if data_type not in DATA_TYPES:
     raise NotImplementedError(f"{data_type} is not valid for ETL")
 
-  all_records = consolidate_records(data_type)
+  rows = (records.to_row(data_type, record) for record in consolidate_records(data_type, cycle=cycle))
 
-  write_final_csv(all_records, file_path=f"./data/seeds/ALL_CANDIDATES_{data_type.upper()}.csv")
+  file_path = seed_path(data_type, cycle)
+  os.makedirs(os.path.dirname(file_path), exist_ok=True)
+  write_final_csv(rows, file_path=file_path, headers=SEED_HEADERS[data_type])
+  write_arrow_seed(data_type, cycle)
 
 
-def consolidate_records(data_type=""):
+def generate_all(cycle=DEFAULT_CYCLE, data_types=None, max_workers=None):
+  """
+  Builds every seed file at once, one worker process per data type, so the
+  whole ETL takes about as long as the slowest type. Each worker writes its
+  own seed and files are read in sorted order, so the output is the same as
+  running them one by one
+  """
+  data_types = data_types or DATA_TYPES
+  for data_type in data_types:
+    if data_type not in DATA_TYPES:
+      raise NotImplementedError(f"{data_type} is not valid for ETL")
+
+  with ProcessPoolExecutor(max_workers=max_workers or len(data_types)) as pool:
+    # list() so an exception in any worker gets raised here
+    list(pool.map(generate_master_data_file_for_type, data_types, [cycle] * len(data_types)))
+
+
+def generate_master_data_files_for_cycles(data_type="", cycles=None):
+  """
+  One seed per cycle, each only reads its own ./data/{data_type}/{cycle}/ partition
+  """
+  for cycle in cycles or [DEFAULT_CYCLE]:
+    generate_master_data_file_for_type(data_type, cycle=cycle)
+
+
+def consolidate_records(data_type="", cycle=DEFAULT_CYCLE):
   """
   This script relies on all records already being pulled for all candidates
   which takes a few days based on OpenSecrets API limit
+
+  Generator, yields one record (see records.py) at a time so only one file is
+  ever open and nothing piles up in memory. Files are read in sorted order so
+  the seed comes out the same every time
   """
 
-  dir_to_read = f"./data/{data_type}"
-  all_files = list_files_in_dir(dir_to_read)
-  all_records = []
+  dir_to_read = cycle_dir(data_type, cycle)
+  all_files = sorted(name for name in list_files_in_dir(dir_to_read) if name.endswith(".csv"))
 
   print(f"Working on {len(all_files)} files in dir {dir_to_read}")
 
-  for file_name in all_files:
-    print(f"on file {file_name}")
-    if file_name == ".DS_Store":
-      continue
-    with open(f"./data/{data_type}/{file_name}", "r") as infile:
-      reader = csv.DictReader(infile)
-      data = [row for row in reader]
-
+  # timed from the first record to the last, so whatever the caller does with
+  # each record is in there too. Counts are kept locally and only go to the
+  # metrics, once, when they're enabled
+  start = time.perf_counter()
+  files = rows = 0
+  try:
+    for file_name in all_files:
+      for record in iter_file_records(data_type, file_name, cycle=cycle):
+        rows += 1
+        yield record
+      files += 1
+  finally:
+    if metrics.enabled:
+      metrics.observe("etl_consolidate_seconds", time.perf_counter() - start, data_type=data_type)
+      metrics.inc("etl_files_total", files, data_type=data_type)
+      metrics.inc("etl_rows_total", rows, data_type=data_type)
+
+
+def iter_file_records(data_type, file_name, cycle=DEFAULT_CYCLE):
+  with open(f"{cycle_dir(data_type, cycle)}{file_name}", "r") as infile:
+    for row in csv.DictReader(infile):
       if data_type == STATES:
-        for cand in data:
-          cand["state"] = cand["office"][:2]
+        row["state"] = state_for_office(row["office"])
       elif data_type != SUMMARIES:
         # Only the state / summary records contain a CID column, but we need it
         # to be able to uniquely identify candidates across datasets
-        for record in data:
-          record["cid"] = file_name.split(".")[0]  # N00003028.csv -> N00003028
+        row["cid"] = file_name.split(".")[0]  # N00003028.csv -> N00003028
 
-      all_records.extend(data)
+      yield records.from_row(data_type, row)
 
-  return all_records
 
-def write_final_csv(all_records, file_path=""):
+def update_seed_rows(data_type="", cids=None, cycle=DEFAULT_CYCLE):
+  """
+  Swaps in the rows for just these candidates instead of rebuilding the whole
+  seed, used after an incremental refresh. Replaced candidates keep their
+  position in the file so diffs stay small, new ones go at the end
+  """
+  if data_type not in [CONTRIBUTORS, INDUSTRIES, SECTORS, SUMMARIES]:
+    raise NotImplementedError(f"{data_type} can't be patched by candidate")
+
+  pending_cids = dict.fromkeys(cids)
+  file_path = seed_path(data_type, cycle)
+
+  def new_rows(cid):
+    for record in iter_file_records(data_type, f"{cid}.csv", cycle=cycle):
+      yield records.to_row(data_type, record)
+
+  def patched_records(existing):
+    for row in existing:
+      if row["cid"] not in pending_cids:
+        yield row
+      elif pending_cids[row["cid"]] is None:
+        # first old row for this candidate, put all of the new ones here
+        pending_cids[row["cid"]] = True
+        yield from new_rows(row["cid"])
+
+    for cid, written in pending_cids.items():
+      if written is None:
+        yield from new_rows(cid)
+
+  # stream into a temp file, we're reading the seed we're replacing
+  tmp_path = f"{file_path}.tmp"
+  with open(file_path, "r") as infile:
+    write_final_csv(
+      patched_records(csv.DictReader(infile)),
+      file_path=tmp_path,
+      headers=SEED_HEADERS[data_type],
+    )
+  os.replace(tmp_path, file_path)
+  write_arrow_seed(data_type, cycle)
+
+
+def write_final_csv(records, file_path="", headers=None):
   """
   Compiles the reps from all 50 state files into one master csv
   So I can seed a DB with it directly (and make updating easier)
+
+  records can be any iterable, rows are written as they come. Columns not in
+  headers are dropped and missing ones are left blank, so files with slightly
+  different columns still line up
   """
-  # Maybe filter out the extra stuff from the STATES file?
-  headers = all_records[0].keys()
+  records = iter(records)
+  if headers is None:
+    first = next(records, None)
+    if first is None:
+      print(f"No records for {file_path}, nothing written")
+      return
+    headers = list(first.keys())
+    records = itertools.chain([first], records)
+
+  count = 0
   with open(f"{file_path}", "w") as outfile:
-    writer = csv.DictWriter(outfile, fieldnames=headers)
+    writer = csv.DictWriter(outfile, fieldnames=headers, restval="", extrasaction="ignore")
     writer.writeheader()
 
-    for rep in all_records:
+    for rep in records:
       writer.writerow(rep)
+      count += 1
 
-  print(f"Saved {len(all_records)} records to {file_path}, Done.")
+  print(f"Saved {count} records to {file_path}, Done.")
 
 
-def create_cid_state_map():
-  # read all_candidates_summaries, it has a state column
-  with open("./data/summaries/ALL_CANDIDATES_SUMMARIES.csv") as infile:
-      reader = csv.DictReader(infile)
-      data = [row for row in reader]
-    
-  cid_state_map = {}
-  for cand in data:
-    cid_state_map[cand["cid"]] = cand["state"]
+def create_cid_state_map(cycle=DEFAULT_CYCLE):
+  """
+  cid -> state for every candidate in the cycle, artifacts.build_lookup_artifacts
+  writes this out as CID_STATE_MAP. The cycle's summaries say where a rep was
+  at the time, the roster index fills in everyone they leave blank or out
+  """
+  cid_state_map = roster_index().cid_state_map()
+  summaries = read_seed_frame(SUMMARIES, cycle, columns=["cid", "state"])
+  for cid, state in zip(summaries["cid"], summaries["state"]):
+    if isinstance(state, str) and state:
+      cid_state_map[cid] = state
 
-  # just manually paste this thing into a data file
   return cid_state_map
 
 
-def sum_sectors_by_state():
-  with open("./data/sectors/ALL_CANDIDATES_SECTORS.csv") as infile:
-    reader = csv.DictReader(infile)
-    data = [row for row in reader]
+def sum_sectors_by_state(cycles=None):
+  """
+  Totals across the given cycles, only those cycles' seeds get read.
+  See aggregate.py for any other grouping
+  """
+  totals = aggregate_to_dict(SECTORS, by=["state"], cycles=cycles)
 
   # prepopulate this for ease
   result = {}
   for state in STATE_ABBREV_MAP.keys():
-    result[state] = {
+    result[state] = totals.get(state, {
       "indivs": 0,
       "pacs": 0,
       "total": 0,
-    }
-
-  for rep in data:
-    state = CID_STATE_MAP[rep["cid"]]
-    result[state]["indivs"] += int(rep["indivs"])
-    result[state]["pacs"] += int(rep["pacs"])
-    result[state]["total"] += int(rep["total"])
+    })
 
   return result
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+DEFAULT_CYCLE = "2022"
+
+# the state rosters come from getLegislators, which has no cycle, so they're
+# the one data type that isn't partitioned by cycle
+UNPARTITIONED_TYPES = ["states"]
+
+
+def cycle_dir(data_type="", cycle=DEFAULT_CYCLE):
+    """
+    Per candidate files live in ./data/{data_type}/{cycle}/{cid}.csv
+    """
+    if data_type in UNPARTITIONED_TYPES:
+        return f"./data/{data_type}/"
+
+    return f"./data/{data_type}/{cycle}/"
+
+
+def cid_file_path(data_type="", cid="", cycle=DEFAULT_CYCLE):
+    return f"{cycle_dir(data_type, cycle)}{cid}.csv"
+
+
+def seed_path(data_type="", cycle=DEFAULT_CYCLE):
+    """
+    Seeds live in ./data/seeds/{cycle}/ALL_CANDIDATES_{TYPE}.csv so reading one
+    cycle never touches another
+    """
+    file_name = f"ALL_CANDIDATES_{data_type.upper()}.csv"
+    if data_type in UNPARTITIONED_TYPES:
+        return f"./data/seeds/{file_name}"
+
+    return f"./data/seeds/{cycle}/{file_name}"
+
+
+def available_cycles(data_type=""):
+    """
+    Cycles we have per candidate files for, newest first
+    """
+    root = Path(f"./data/{data_type}/")
+    if not root.exists():
+        return []
+
+    return sorted([path.name for path in root.iterdir() if path.is_dir()], reverse=True)
@@ -0,0 +1,189 @@
+from dataclasses import dataclass, fields
+from datetime import date
+
+from server.data.columnar import SEED_DTYPES, date_formats, parse_date
+
+# One slotted record type per seed, fields in the same order as the seed
+# columns / the tables in ../schema/*.sql. Values get parsed once, with the
+# same types as the Arrow seeds (columnar.SEED_DTYPES) and the same date
+# parser. Dates go back out in the type's first format. A date matching none
+# of the formats is kept as the original text here, the Arrow seed build
+# refuses it instead of writing a null
+
+
+@dataclass(slots=True)
+class Contribution:
+    org_name: str
+    total: int | None
+    pacs: int | None
+    indivs: int | None
+    cycle: int | None
+    source: str
+    cid: str
+
+
+@dataclass(slots=True)
+class IndustryTotal:
+    industry_code: str
+    industry_name: str
+    indivs: int | None
+    pacs: int | None
+    total: int | None
+    last_updated: date | None
+    cycle: int | None
+    cid: str
+
+
+@dataclass(slots=True)
+class SectorTotal:
+    sector_name: str
+    sectorid: str
+    indivs: int | None
+    pacs: int | None
+    total: int | None
+    last_updated: date | None
+    cycle: int | None
+    cid: str
+
+
+@dataclass(slots=True)
+class Candidate:
+    cid: str
+    firstlast: str
+    lastname: str
+    party: str
+    office: str
+    gender: str
+    first_elected: int | None
+    phone: str
+    website: str
+    congress_office: str
+    twitter_id: str
+    youtube_url: str
+    facebook_id: str
+    birthdate: date | str | None  # str when it matches none of the formats
+    state: str
+
+
+@dataclass(slots=True)
+class Summary:
+    cand_name: str
+    cid: str
+    cycle: str
+    state: str
+    party: str
+    chamber: str
+    first_elected: int | None
+    next_election: int | None
+    total: float | None
+    spent: float | None
+    cash_on_hand: float | None
+    debt: float | None
+    origin: str
+    source: str
+    last_updated: date | None
+
+
+RECORD_TYPES = {
+    "contributors": Contribution,
+    "industries": IndustryTotal,
+    "sectors": SectorTotal,
+    "states": Candidate,
+    "summaries": Summary,
+}
+
+
+def from_row(data_type, row):
+    """
+    Parses a csv / API row (a dict of strings) into the data type's record,
+    columns the record doesn't have are dropped and missing ones left empty
+    """
+    record_type = RECORD_TYPES[data_type]
+    return record_type(*[parse(row.get(name, "")) for name, parse, _ in _converters(data_type)])
+
+
+def to_row(data_type, record):
+    """
+    Back to a dict of strings for csv.DictWriter, in the same format it came in
+    """
+    return {name: format_value(getattr(record, name)) for name, _, format_value in _converters(data_type)}
+
+
+def headers(data_type):
+    return [field.name for field in fields(RECORD_TYPES[data_type])]
+
+
+# data_type -> [(field name, parser, formatter)], worked out once per type
+_CONVERTERS = {}
+
+
+def _converters(data_type):
+    if data_type not in _CONVERTERS:
+        dtypes = SEED_DTYPES[data_type]
+        _CONVERTERS[data_type] = [
+            (name, *_converter_for(dtypes[name])) for name in headers(data_type)
+        ]
+
+    return _CONVERTERS[data_type]
+
+
+def _converter_for(dtype):
+    if dtype.startswith("date:"):
+        formats = date_formats(dtype)
+        return _date_parser(formats), _date_formatter(formats[0])
+    if dtype == "Int64":
+        return _parse_int, _format_number
+    if dtype == "float64":
+        return _parse_float, _format_number
+    return _parse_string, _format_string
+
+
+def _parse_string(value):
+    return "" if value is None else str(value)
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _date_parser(formats):
+    def parse(value):
+        if not value:
+            return None
+        try:
+            return parse_date(value, formats)
+        except ValueError:
+            return value
+
+    return parse
+
+
+def _format_string(value):
+    return value
+
+
+def _format_number(value):
+    if value is None:
+        return ""
+    # 0.0 goes back out as 0, like the API sent it
+    text = repr(value)
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _date_formatter(date_format):
+    def format_value(value):
+        if value is None:
+            return ""
+        return value if isinstance(value, str) else value.strftime(date_format)
+
+    return format_value
@@ -0,0 +1,185 @@
+import csv
+import hashlib
+import io
+import json
+import os
+from dataclasses import dataclass
+
+from server.data.paths import cycle_dir, seed_path
+
+STATES = "states"
+
+INDEX_PATH = "./data/artifacts/roster_index.json"
+
+# bump when the saved format changes, older files just get rebuilt
+INDEX_VERSION = 1
+
+
+@dataclass(slots=True)
+class RosterEntry:
+    cid: str
+    state: str
+    office: str
+    chamber: str
+    party: str
+
+
+def state_for_office(office):
+    # office is e.g. NJ01 for a house seat, NJS1 for the senate
+    return office[:2]
+
+
+def chamber_for_office(office):
+    return "S" if office[2:3] == "S" else "H"
+
+
+class RosterIndex(object):
+    """
+    cid -> state / office / chamber / party for everyone in the state files,
+    parsed once and saved to INDEX_PATH so nothing has to reopen 50 csvs to
+    get a list of cids. refresh() stats every state file and only reparses
+    the ones whose mtime or size changed and whose hash then doesn't match,
+    so a touched but unchanged file costs one read and nothing else.
+
+    Without any state files (a deploy with only the seeds) it indexes the
+    states seed instead. Use roster_index() rather than building one of these
+    """
+
+    def __init__(self, states_dir=None, index_path=INDEX_PATH):
+        self.states_dir = states_dir or cycle_dir(STATES)
+        self.index_path = index_path
+        self.sources = {}  # file path -> {"mtime_ns", "size", "sha256", "rows"}
+        self.entries = {}
+        self._load()
+        self.refresh()
+
+    def refresh(self):
+        """
+        Brings the index up to date with the files on disk, returns True if
+        anything had to be reparsed
+        """
+        changed = False
+        sources = {}
+        for file_path in self._source_paths():
+            stat = os.stat(file_path)
+            source = self.sources.get(file_path)
+            if source is not None and (source["mtime_ns"], source["size"]) == (stat.st_mtime_ns, stat.st_size):
+                sources[file_path] = source
+                continue
+
+            with open(file_path, "rb") as infile:
+                content = infile.read()
+            sha256 = hashlib.sha256(content).hexdigest()
+            if source is None or source["sha256"] != sha256:
+                source = {"sha256": sha256, "rows": _parse_rows(content)}
+                changed = True
+            sources[file_path] = {**source, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+        # a deleted state file takes its candidates with it
+        changed = changed or sources.keys() != self.sources.keys()
+        stat_changed = sources != self.sources
+        self.sources = sources
+        if changed or not self.entries:
+            self.entries = {
+                row[0]: RosterEntry(*row) for source in self.sources.values() for row in source["rows"]
+            }
+        if stat_changed:
+            self._save()
+
+        return changed
+
+    def get(self, cid):
+        return self.entries.get(cid)
+
+    def cids(self):
+        """
+        Every cid once, state file by state file in file name order
+        """
+        return list(self.entries.keys())
+
+    def cids_by_file(self):
+        # file name -> cids, in the order they're listed in the file
+        return {
+            os.path.basename(file_path): [row[0] for row in source["rows"]]
+            for file_path, source in self.sources.items()
+        }
+
+    def cid_state_map(self):
+        return {cid: entry.state for cid, entry in self.entries.items()}
+
+    def checksum(self):
+        """
+        Changes whenever any source file's contents do
+        """
+        digest = hashlib.sha256()
+        for file_path, source in self.sources.items():
+            digest.update(f"{os.path.basename(file_path)}:{source['sha256']}\n".encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, cid):
+        return cid in self.entries
+
+    def _source_paths(self):
+        if os.path.isdir(self.states_dir):
+            file_names = sorted(name for name in os.listdir(self.states_dir) if name.endswith(".csv"))
+            if file_names:
+                return [os.path.join(self.states_dir, name) for name in file_names]
+
+        if os.path.exists(seed_path(STATES)):
+            return [seed_path(STATES)]
+
+        return []
+
+    def _load(self):
+        try:
+            with open(self.index_path) as infile:
+                saved = json.load(infile)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+
+        if saved.get("version") == INDEX_VERSION and saved.get("states_dir") == self.states_dir:
+            self.sources = saved["sources"]
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        # pid in the name, the etl's worker processes can all get here at once
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as outfile:
+            json.dump(
+                {"version": INDEX_VERSION, "states_dir": self.states_dir, "sources": self.sources},
+                outfile,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.index_path)
+
+
+def _parse_rows(content):
+    rows = []
+    for row in csv.DictReader(io.StringIO(content.decode("utf-8"))):
+        office = row["office"]
+        rows.append([row["cid"], state_for_office(office), office, chamber_for_office(office), row["party"]])
+
+    return rows
+
+
+_indexes = {}
+
+
+def roster_index(states_dir=None, index_path=INDEX_PATH):
+    """
+    The process wide RosterIndex for states_dir, refreshed on every call so
+    a state file rewritten a second ago is already in it
+    """
+    # absolute, the bench and replay harnesses chdir between scratch data dirs
+    key = (os.path.abspath(states_dir or cycle_dir(STATES)), os.path.abspath(index_path))
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = RosterIndex(*key)
+    else:
+        index.refresh()
+
+    return index
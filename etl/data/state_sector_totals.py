@@ -1,54 +0,0 @@
-# Generated by the logic in ETL.py
-# The things I'll do to avoid setting up a database
-STATE_SECTOR_TOTALS = {
-    "AL": {"indivs": 3978840, "pacs": 5956241, "total": 9935081},
-    "AK": {"indivs": 10599860, "pacs": 5236201, "total": 15836061},
-    "AZ": {"indivs": 19586086, "pacs": 7485200, "total": 27071286},
-    "AR": {"indivs": 14699965, "pacs": 7886632, "total": 22586597},
-    "CA": {"indivs": 74529094, "pacs": 38618887, "total": 113147981},
-    "CO": {"indivs": 18854324, "pacs": 6901785, "total": 25756109},
-    "CT": {"indivs": 16546026, "pacs": 7594155, "total": 24140181},
-    "DE": {"indivs": 4654231, "pacs": 5605779, "total": 10260010},
-    "FL": {"indivs": 44461194, "pacs": 18361723, "total": 62822917},
-    "GA": {"indivs": 14021687, "pacs": 6582687, "total": 20604374},
-    "HI": {"indivs": 8360014, "pacs": 4784649, "total": 13144663},
-    "ID": {"indivs": 4696059, "pacs": 6045342, "total": 10741401},
-    "IL": {"indivs": 33166779, "pacs": 18675764, "total": 51842543},
-    "IN": {"indivs": 20571669, "pacs": 8673198, "total": 29244867},
-    "IA": {"indivs": 10486669, "pacs": 5851059, "total": 16337728},
-    "KS": {"indivs": 6333426, "pacs": 5127766, "total": 11461192},
-    "KY": {"indivs": 22939572, "pacs": 11787067, "total": 34726639},
-    "LA": {"indivs": 25928284, "pacs": 9522676, "total": 35450960},
-    "ME": {"indivs": 10567007, "pacs": 5076845, "total": 15643852},
-    "MD": {"indivs": 14992283, "pacs": 8515446, "total": 23507729},
-    "MA": {"indivs": 28759852, "pacs": 9020093, "total": 37779945},
-    "MI": {"indivs": 30880380, "pacs": 16525116, "total": 47405496},
-    "MN": {"indivs": 20768063, "pacs": 7517724, "total": 28285787},
-    "MS": {"indivs": 6643418, "pacs": 6346623, "total": 12990041},
-    "MO": {"indivs": 19286408, "pacs": 14948782, "total": 34235190},
-    "MT": {"indivs": 24827057, "pacs": 6845474, "total": 31672531},
-    "NE": {"indivs": 8056296, "pacs": 7697374, "total": 15753670},
-    "NV": {"indivs": 34895169, "pacs": 5127427, "total": 40022596},
-    "NH": {"indivs": 20551786, "pacs": 5125430, "total": 25677216},
-    "NJ": {"indivs": 48488797, "pacs": 13881165, "total": 62369962},
-    "NM": {"indivs": 6803590, "pacs": 4614588, "total": 11418178},
-    "NY": {"indivs": 49017123, "pacs": 23140995, "total": 72158118},
-    "NC": {"indivs": 21993021, "pacs": 15832330, "total": 37825351},
-    "ND": {"indivs": 5482425, "pacs": 3172016, "total": 8654441},
-    "OH": {"indivs": 40255601, "pacs": 23886311, "total": 64141912},
-    "OK": {"indivs": 7311121, "pacs": 8085707, "total": 15396828},
-    "OR": {"indivs": 13482545, "pacs": 9752703, "total": 23235248},
-    "PA": {"indivs": 50136971, "pacs": 21441927, "total": 71578898},
-    "RI": {"indivs": 7436425, "pacs": 4359658, "total": 11796083},
-    "SC": {"indivs": 16940405, "pacs": 12634879, "total": 29575284},
-    "SD": {"indivs": 7982800, "pacs": 6570849, "total": 14553649},
-    "TN": {"indivs": 12581815, "pacs": 5169857, "total": 17751672},
-    "TX": {"indivs": 63603058, "pacs": 26014432, "total": 89617490},
-    "UT": {"indivs": 8987790, "pacs": 2426021, "total": 11413811},
-    "VT": {"indivs": 5393721, "pacs": 2448049, "total": 7841770},
-    "VA": {"indivs": 39458030, "pacs": 12291610, "total": 51749640},
-    "WA": {"indivs": 26676273, "pacs": 12903738, "total": 39580011},
-    "WV": {"indivs": 9271721, "pacs": 7926699, "total": 17198420},
-    "WI": {"indivs": 38726659, "pacs": 10493152, "total": 49219811},
-    "WY": {"indivs": 3656830, "pacs": 4033114, "total": 7689944},
-}
@@ -1,197 +1,477 @@
-import csv
+import asyncio
+import hashlib
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-from server.data.utils import list_files_in_dir
+from server.data import etl, records
+from server.data.paths import DEFAULT_CYCLE, cid_file_path, cycle_dir
+from server.data.roster_index import roster_index
+from server.metrics import metrics
+from api_cache import ApiCache
 from client import Client, RateLimitError, ClientError
-from server.constants import (
-    API_KEY,
-    FAILED_CONTRIBUTOR_CIDS,
-    FAILED_INDUSTRY_CIDS,
-    FAILED_SECTOR_CIDS,
-    STATE_ABBREV_MAP,
-)
+from journal import EMPTY, ERROR, NOT_FOUND, OK, PullJournal
+from quota import QuotaScheduler
+from rankings import RANKED_COLUMNS
+from roster import state_file_path, sync_state_files, write_state_file
+from staging import OutputStager, render_csv
+from server.constants import API_KEY, STATE_ABBREV_MAP
 
 def write_state_csv(state_code="", client=None):
     state_reps = client.get_legislators_for_state(state_code=state_code)
-    headers = state_reps[0]["@attributes"].keys()
 
-    file_name = f"data/{state_code}.csv"
-    with open(file_name, "w") as outfile:
-        writer = csv.DictWriter(outfile, fieldnames=headers)
-        writer.writeheader()
-
-        for rep in state_reps:
-            writer.writerow(rep["@attributes"])
+    file_name = state_file_path(state_code)
+    write_state_file(file_name, [rep["@attributes"] for rep in state_reps])
 
     print(f"{file_name} written with {len(state_reps)} entries")
 
 
 def write_all_states(client=None):
     if client is None:
-        client = Client(api_key=API_KEY)
+        client = Client(api_key=API_KEY, quota=QuotaScheduler())
 
     for state_code in STATE_ABBREV_MAP.keys():
         write_state_csv(state_code=state_code, client=client)
         time.sleep(1)
 
 
+def write_all_states_concurrently(client=None, concurrency=5):
+    """
+    Same as write_all_states but without the serial sleep, at most
+    `concurrency` getLegislators calls are in flight at once
+    """
+    if client is None:
+        client = Client(api_key=API_KEY, quota=QuotaScheduler())
+
+    jobs = [
+        (state_code, lambda state_code=state_code: write_state_csv(state_code=state_code, client=client))
+        for state_code in STATE_ABBREV_MAP.keys()
+    ]
+    failures = asyncio.run(run_with_bounded_concurrency(jobs, concurrency=concurrency))
+    print(f"All done. The following states failed to fetch: {failures}")
+
+
+async def run_with_bounded_concurrency(jobs, concurrency=8, failures=None):
+    """
+    jobs is a list of (label, callable) tuples. Runs the blocking callables on a
+    thread pool with at most `concurrency` in flight.
+
+    On the first RateLimitError nothing new gets started, the calls already in
+    flight are allowed to finish and then the RateLimitError is re-raised.
+    Returns the labels of jobs that failed with a ClientError or KeyError, they're
+    also appended to `failures` if passed in so a caller still has them after a rate limit
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limited = asyncio.Event()
+    failures = [] if failures is None else failures
+
+    async def run_job(label, job, executor):
+        async with semaphore:
+            if rate_limited.is_set():
+                return
+            try:
+                await loop.run_in_executor(executor, job)
+            except RateLimitError:
+                rate_limited.set()
+            # KeyError happens if returned data is empty
+            except (ClientError, KeyError) as e:
+                failures.append(label)
+                print(f"Error getting data for {label}: {e}")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        await asyncio.gather(*(run_job(label, job, executor) for label, job in jobs))
+
+    if rate_limited.is_set():
+        print(f"Rate limit exceeded. All failures: {failures}")
+        raise RateLimitError("call limit has been reached")
+
+    return failures
+
+
 class DataPuller(object):
-    def __init__(self, client=None):
+    def __init__(self, client=None, quota=None, cache=None, journal=None, cycles=None):
+        """
+        If you pass in your own client, pass the same QuotaScheduler and ApiCache
+        to both so the budget this sees is the one the client is spending
+
+        cycles are the election cycles pull_data_for_all_methods schedules,
+        newest first gets the budget first
+        """
+        self.cycles = cycles
+        if cycles is None:
+            self.cycles = [DEFAULT_CYCLE]
+
+        self.journal = journal
+        if journal is None:
+            self.journal = PullJournal()
+
+        self.quota = quota
+        if quota is None:
+            self.quota = QuotaScheduler()
+
+        self.cache = cache
+        if cache is None:
+            self.cache = ApiCache()
+
         self.client = client
         if client is None:
-            self.client = Client(api_key=API_KEY)
+            self.client = Client(api_key=API_KEY, quota=self.quota, cache=self.cache)
+
+        # every per candidate csv goes through here, see write_records
+        self.stager = OutputStager()
 
         self.method_map = {
             "sectors": {
-                "failures": FAILED_SECTOR_CIDS,
-                "file_path": "./data/sectors/",
+                "api_method": "candSector",
                 "fetch_function": self.get_sector_summary_for_cid,
             },
             "industries": {
-                "failures": FAILED_INDUSTRY_CIDS,
-                "file_path": "./data/industries/",
+                "api_method": "candIndustry",
                 "fetch_function": self.get_top_ten_industries_for_cid,
             },
             "summaries": {
-                "failures": [],  # doesn't matter, rate limit is higher here, also rarely fails
-                "file_path": "./data/summaries/",
+                "api_method": "candSummary",
                 "fetch_function": self.get_candidate_overall_summary,
             },
             "contributors": {
-                "failures": FAILED_CONTRIBUTOR_CIDS,
-                "file_path": "./data/contributors/",
+                "api_method": "candContrib",
                 "fetch_function": self.get_candidate_contributors,
             }
         }
 
-    def pull_data_for_all_candidates(self, method=""):
+        # data pulled before the journal existed only lives on disk, record it once
+        # so we never have to scan the output directories again
+        for method in self.method_map.keys():
+            for cycle in self.cycles:
+                if not self.journal.has_entries_for(method, cycle=cycle):
+                    self.journal.import_existing_files(method, cycle_dir(method, cycle), cycle=cycle)
+
+    def sync_roster(self, states=None, concurrency=5):
+        """
+        Fetches getLegislators for every state (or just `states`), `concurrency`
+        at a time and never more than today's getLegislators quota, then diffs
+        the result against ./data/states/. Only the state files that changed get
+        rewritten, and only the added candidates and the ones whose office or
+        party changed get queued in the journal for every method and cycle,
+        so the next pull_data_for_all_methods re-pulls just them. Always goes
+        to the API, a cached roster would hide exactly the changes this is for.
+
+        States that fail, come back empty or don't fit in the quota keep their
+        old file.
+        Returns the RosterDiff
+        """
+        states = list(states or STATE_ABBREV_MAP.keys())
+        budget = self.quota.remaining("getLegislators")
+        if budget < len(states):
+            print(f"Only {budget} getLegislators calls left today, syncing {states[:budget]}")
+            states = states[:budget]
+
+        fetched = {}
+
+        def make_job(state_code):
+            def job():
+                reps = self.client.get_legislators_for_state(state_code=state_code, read_cache=False)
+                fetched[state_code] = [rep["@attributes"] for rep in reps]
+            return job
+
+        try:
+            failures = asyncio.run(run_with_bounded_concurrency(
+                [(state_code, make_job(state_code)) for state_code in states], concurrency=concurrency
+            ))
+        except RateLimitError:
+            failures = [state_code for state_code in states if state_code not in fetched]
+
+        diff = sync_state_files(fetched)
+        for method in self.method_map.keys():
+            for cycle in self.cycles:
+                self.journal.queue(method, diff.affected_cids(), cycle=cycle)
+
+        print(
+            f"Synced {len(fetched)} states, rewrote {diff.written_states}. "
+            f"{len(diff.added)} added, {len(diff.removed)} removed, {len(diff.changed)} changed. "
+            f"Failures: {failures}, empty: {diff.skipped_states}"
+        )
+        return diff
+
+    def pull_data_for_all_candidates(self, method="", cycle=DEFAULT_CYCLE):
         """
         Assumes getLegislators has already been run for all states
         and the data is saved in ./data/states/{state_code}.csv
+        Output goes to ./data/{method}/{cycle}/{cid}.csv
 
         method must be in the known methods list
         """
         if method not in self.method_map.keys():
             raise NotImplementedError(f"Cannot pull data for method: {method}")
 
-        # so we don't go fetch things for candidates we already did, OS api has a small
-        # daily call limit, don't want to do extra work
-        existing_candidate_summaries = list_files_in_dir(
-            self.method_map[method]["file_path"]
-        )
-
-        # this relies on the files being saved in CID.csv format
-        existing_cid_set = set(
-            [name.split(".")[0] for name in existing_candidate_summaries]
-        )
-
-        # these are ones that failed mostly due to 404 cuz the data is missing
-        existing_cid_set.update(self.method_map[method]["failures"])
-
-        state_csvs = list_files_in_dir("./data/states/")
+        seen_cids = set()
 
         failures = []
         # get all CIDs for a state
-        for state_file_name in state_csvs:
-            print(f"Working on file: {state_file_name}")
-            state_cids = self.get_candidate_ids_from_state_file(
-                f"./data/states/{state_file_name}"
-            )
-
-            for cid in state_cids:
-                # make sure we're not doing duplicate work
-                # we'll have to run this script over a number of days
-                # to get around OpenSecrets API limit so we need to limit calls
-                if cid in existing_cid_set:
-                    print(f"CID {cid} already saved, skipping")
-                    continue
-
-                existing_cid_set.add(cid)
-                try:
-                    self.method_map[method]["fetch_function"](cid)
-                except RateLimitError as e:
-                    print(f"Rate limit exceeded. All failures: {failures}")
-                    raise e
-                # KeyError happens if returned data is empty
-                except (ClientError, KeyError) as e:
-                    failures.append(f"{state_file_name}_{cid}")
-                    print(f"Error getting data for CID: {cid}: {e}")
-                    continue
-
-            print(f"File {state_file_name} complete")
+        with self.stager.batch(dirs=[cycle_dir(method, cycle)]):
+            for state_file_name, state_cids in roster_index().cids_by_file().items():
+                print(f"Working on file: {state_file_name}")
+
+                for cid in state_cids:
+                    # make sure we're not doing duplicate work
+                    # we'll have to run this script over a number of days
+                    # to get around OpenSecrets API limit so we need to limit calls
+                    if cid in seen_cids or self.journal.should_skip(method, cid, cycle=cycle):
+                        print(f"CID {cid} already saved, skipping")
+                        continue
+
+                    seen_cids.add(cid)
+                    try:
+                        self.pull_cid(method, cid, cycle=cycle)
+                    except RateLimitError as e:
+                        print(f"Rate limit exceeded. All failures: {failures}")
+                        raise e
+                    # KeyError happens if returned data is empty
+                    except (ClientError, KeyError) as e:
+                        failures.append(f"{state_file_name}_{cid}")
+                        print(f"Error getting data for CID: {cid}: {e}")
+                        continue
+
+                print(f"File {state_file_name} complete")
 
         print(f"All done. The following candidates failed to fetch: {failures}")
 
-    def get_candidate_ids_from_state_file(self, file_path):
-        candidate_ids = []
-        with open(file_path) as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # CID is candidate ID
-                candidate_ids.append(row["cid"])
+    def pull_data_for_all_candidates_concurrently(self, method="", cycle=DEFAULT_CYCLE, concurrency=8):
+        """
+        Async version of pull_data_for_all_candidates, fetches up to `concurrency`
+        CIDs at once. Same skip rules, and it stops on the first rate limit error.
+        Keep concurrency at or below the client's pool_size so connections get reused
+        """
+        return asyncio.run(
+            self.pull_data_for_all_candidates_async(method=method, cycle=cycle, concurrency=concurrency)
+        )
 
-        return candidate_ids
+    async def pull_data_for_all_candidates_async(self, method="", cycle=DEFAULT_CYCLE, concurrency=8):
+        if method not in self.method_map.keys():
+            raise NotImplementedError(f"Cannot pull data for method: {method}")
 
-    def get_sector_summary_for_cid(self, cid):
-        # wrap this in a try / except in the eventual caller to be safe
-        # also handle the "does this file already exist? but in the caller"
-        response = self.client.get_candidate_total_by_sector(cid=cid, cycle="2022")
+        seen_cids = set()
 
-        # this needs to get the right keys now
-        data = response["data"]
+        jobs = []
+        for state_file_name, state_cids in roster_index().cids_by_file().items():
+            for cid in state_cids:
+                if cid in seen_cids or self.journal.should_skip(method, cid, cycle=cycle):
+                    continue
+
+                seen_cids.add(cid)
+                jobs.append(
+                    (
+                        f"{state_file_name}_{cid}",
+                        lambda cid=cid: self.pull_cid(method, cid, cycle=cycle),
+                    )
+                )
+
+        print(f"Pulling {cycle} {method} for {len(jobs)} candidates, {concurrency} at a time")
+        with self.stager.batch(dirs=[cycle_dir(method, cycle)]):
+            failures = await run_with_bounded_concurrency(jobs, concurrency=concurrency)
+        print(f"All done. The following candidates failed to fetch: {failures}")
 
-        # .keys() returns dict_keys class, turn it to a list
-        headers = list(data[0]["@attributes"].keys())
-        headers.extend(["last_updated", "cycle"])
+    def pull_data_for_all_methods(self, methods=None, cycles=None, concurrency=4):
+        """
+        Interleaves the pull jobs for every method in method_map so each endpoint's
+        daily budget gets used in one run. Each method only gets as many jobs as it
+        has calls left in the quota, and a rate limit on one endpoint only retires
+        that endpoint, the others keep going.
 
-        file_name = f"./data/sectors/{cid}.csv"
-        with open(file_name, "w") as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=headers)
-            writer.writeheader()
+        Every cycle shares its endpoint's budget, the first cycle listed gets
+        first dibs and the rest get pulled alongside it with whatever is left
+        """
+        if methods is None:
+            methods = list(self.method_map.keys())
+        if cycles is None:
+            cycles = self.cycles
+
+        candidate_ids = roster_index().cids()
+
+        queues = {}
+        for method in methods:
+            if method not in self.method_map.keys():
+                raise NotImplementedError(f"Cannot pull data for method: {method}")
+
+            pending = [
+                (cycle, cid) for cycle in cycles for cid in candidate_ids
+                if not self.journal.should_skip(method, cid, cycle=cycle)
+            ]
+            budget = self.quota.remaining(self.method_map[method]["api_method"])
+            queues[method] = pending[:budget]
+            print(f"{method}: {len(pending)} left to pull, {budget} calls available today")
+
+        rate_limited_methods = set()
+
+        def make_job(method, cycle, cid):
+            def job():
+                if method in rate_limited_methods:
+                    return
+                try:
+                    self.pull_cid(method, cid, cycle=cycle)
+                except RateLimitError:
+                    rate_limited_methods.add(method)
+                    self.quota.exhaust(self.method_map[method]["api_method"])
+            return job
+
+        # round robin across methods so no single endpoint hogs the run
+        jobs = []
+        for i in range(max([len(queue) for queue in queues.values()], default=0)):
+            for method, queue in queues.items():
+                if i < len(queue):
+                    cycle, cid = queue[i]
+                    jobs.append((f"{cycle}_{method}_{cid}", make_job(method, cycle, cid)))
+
+        with self.stager.batch(dirs=[cycle_dir(method, cycle) for method in methods for cycle in cycles]):
+            failures = asyncio.run(run_with_bounded_concurrency(jobs, concurrency=concurrency))
+        print(f"All done. Rate limited: {sorted(rate_limited_methods)}. Failures: {failures}")
+        print(f"Calls left today: {self.quota.summary()}")
+
+    def replay_from_cache(self, method="", cycle=DEFAULT_CYCLE):
+        """
+        Rewrites every ./data/{method}/{cycle}/ file from the raw responses in the cache,
+        ignoring what's already on disk. Never touches the API, candidates that
+        were never fetched just show up as failures
+        """
+        if method not in self.method_map.keys():
+            raise NotImplementedError(f"Cannot replay data for method: {method}")
 
-            for row in data:
-                obj = row["@attributes"]
-                obj["last_updated"] = response["last_updated"]
-                obj["cycle"] = response["cycle"]
-                writer.writerow(obj)
+        offline_puller = DataPuller(
+            client=Client(cache=self.cache, offline=True),
+            quota=self.quota,
+            cache=self.cache,
+            journal=self.journal,
+        )
+        fetch_function = offline_puller.method_map[method]["fetch_function"]
 
-        print(f"wrote file {file_name}")
+        failures = []
+        with offline_puller.stager.batch(dirs=[cycle_dir(method, cycle)]):
+            for state_file_name, state_cids in roster_index().cids_by_file().items():
+                for cid in state_cids:
+                    try:
+                        fetch_function(cid, cycle=cycle)
+                    except (ClientError, KeyError):
+                        failures.append(f"{state_file_name}_{cid}")
 
-    def get_top_ten_industries_for_cid(self, cid):
-        response = self.client.get_candidate_top_ten_industries(cid=cid, cycle="2022")
+        print(f"Replay done. The following candidates could not be replayed: {failures}")
 
-        # this needs to get the right keys now
-        data = response["data"]
+    def pull_cid(self, method, cid, cycle=DEFAULT_CYCLE, read_cache=None):
+        """
+        Runs the fetch function for one candidate and records the outcome in the
+        journal. Rate limits aren't the candidate's fault so they aren't recorded
+        """
+        with metrics.timer("pull_seconds", method=method, outcome=ERROR) as labels:
+            try:
+                last_updated = self.method_map[method]["fetch_function"](cid, cycle=cycle, read_cache=read_cache)
+            except RateLimitError as e:
+                labels["outcome"] = "rate_limited"
+                raise e
+            except ClientError as e:
+                labels["outcome"] = NOT_FOUND if e.status_code == 404 else ERROR
+                self.journal.record(method, cid, labels["outcome"], status=e.status_code, cycle=cycle)
+                raise e
+            # KeyError happens if returned data is empty
+            except KeyError as e:
+                labels["outcome"] = EMPTY
+                self.journal.record(method, cid, EMPTY, status=200, cycle=cycle)
+                raise e
+
+            labels["outcome"] = OK
+            # not until the file is actually on disk, a crash before then means pulling it again
+            self.stager.when_committed(
+                cid_file_path(method, cid, cycle),
+                lambda: self.journal.record(method, cid, OK, status=200, last_updated=last_updated, cycle=cycle),
+            )
 
-        # .keys() returns dict_keys class, turn it to a list
-        headers = list(data[0]["@attributes"].keys())
-        headers.extend(["last_updated", "cycle"])
+    def refresh_stale(self, method="", cycle=DEFAULT_CYCLE, limit=None, concurrency=4, rankings=None):
+        """
+        Incremental refresh: re-fetches the candidates whose data is oldest
+        (by the API's last_updated, then by when we pulled it) instead of
+        skipping everything that already has a file. Uses at most `limit` calls,
+        or whatever's left of today's quota, then patches only the rows for
+        candidates whose data actually changed into the seed file.
+
+        Pass a RankingIndex (e.g. the app's) as `rankings` and the changed
+        candidates' share of it gets updated too
+        """
+        if method not in self.method_map.keys():
+            raise NotImplementedError(f"Cannot refresh data for method: {method}")
 
-        file_name = f"./data/industries/{cid}.csv"
-        with open(file_name, "w") as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=headers)
-            writer.writeheader()
+        budget = self.quota.remaining(self.method_map[method]["api_method"])
+        if limit is not None:
+            budget = min(budget, limit)
 
-            for row in data:
-                obj = row["@attributes"]
-                obj["last_updated"] = response["last_updated"]
-                obj["cycle"] = response["cycle"]
-                writer.writerow(obj)
+        stale_cids = self.journal.stalest(method, cycle=cycle)[:budget]
+        old_hashes = {cid: file_hash(cid_file_path(method, cid, cycle)) for cid in stale_cids}
 
-        print(f"wrote file {file_name}")
+        # the raw response cache would just hand back what we already have
+        jobs = [
+            (f"{method}_{cid}", lambda cid=cid: self.pull_cid(method, cid, cycle=cycle, read_cache=False))
+            for cid in stale_cids
+        ]
 
-    def get_candidate_overall_summary(self, cid):
+        failures = []
+        try:
+            # the batch is written out before the hashes below get compared
+            with self.stager.batch(dirs=[cycle_dir(method, cycle)]):
+                asyncio.run(run_with_bounded_concurrency(jobs, concurrency=concurrency, failures=failures))
+        except RateLimitError:
+            print("Rate limit exceeded, patching seeds with what we got")
+
+        changed_cids = [
+            cid for cid in stale_cids
+            if file_hash(cid_file_path(method, cid, cycle)) != old_hashes[cid]
+        ]
+        print(f"Refreshed {len(stale_cids)} {cycle} {method}, {len(changed_cids)} changed. Failures: {failures}")
+
+        if changed_cids:
+            etl.update_seed_rows(method, changed_cids, cycle=cycle)
+            if rankings is not None and method in RANKED_COLUMNS:
+                rankings.refresh_candidates(method, changed_cids)
+
+        return changed_cids
+
+    def get_sector_summary_for_cid(self, cid, cycle=DEFAULT_CYCLE, read_cache=None):
+        # wrap this in a try / except in the eventual caller to be safe
+        # also handle the "does this file already exist? but in the caller"
+        response = self.client.get_candidate_total_by_sector(cid=cid, cycle=cycle, read_cache=read_cache)
+
+        sectors = [
+            records.from_row("sectors", {
+                **row["@attributes"],
+                "last_updated": response["last_updated"],
+                "cycle": response["cycle"],
+                "cid": cid,
+            })
+            for row in response["data"]
+        ]
+        write_records("sectors", output_path("sectors", cid, cycle), sectors, stager=self.stager)
+        return response["last_updated"]
+
+    def get_top_ten_industries_for_cid(self, cid, cycle=DEFAULT_CYCLE, read_cache=None):
+        response = self.client.get_candidate_top_ten_industries(cid=cid, cycle=cycle, read_cache=read_cache)
+
+        industries = [
+            records.from_row("industries", {
+                **row["@attributes"],
+                "last_updated": response["last_updated"],
+                "cycle": response["cycle"],
+                "cid": cid,
+            })
+            for row in response["data"]
+        ]
+        write_records("industries", output_path("industries", cid, cycle), industries, stager=self.stager)
+        return response["last_updated"]
+
+    def get_candidate_overall_summary(self, cid, cycle=DEFAULT_CYCLE, read_cache=None):
         # candidate overall summary is a much simpler endpoint
-        response = self.client.get_candidate_summary(cid=cid, cycle="2022")
-        file_name = f"./data/summaries/{cid}.csv"
-        with open(file_name, "w") as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=response.keys())
-            writer.writeheader()
-            writer.writerow(response)
-
-        print(f"wrote file {file_name}")
+        response = self.client.get_candidate_summary(cid=cid, cycle=cycle, read_cache=read_cache)
+        summary = records.from_row("summaries", response)
+        write_records("summaries", output_path("summaries", cid, cycle), [summary], stager=self.stager)
+        return response.get("last_updated")
 
-    def get_candidate_contributors(self, cid):
+    def get_candidate_contributors(self, cid, cycle=DEFAULT_CYCLE, read_cache=None):
         """
         Gets contributor organizations / individuals for a given candidate
 
@@ -203,25 +483,44 @@ class DataPuller(object):
         ---
         """
 
-        contributor_data = self.client.get_candidate_contributors(cid=cid, cycle="2022")
-        contributor_list= [item["@attributes"] for item in contributor_data["contributors"]]
-        file_name = f"./data/contributors/{cid}.csv"
-
+        contributor_data = self.client.get_candidate_contributors(cid=cid, cycle=cycle, read_cache=read_cache)
         # org_name, total, pacs, indivs
-        contributor_keys = contributor_list[0].keys()
-        csv_headers = list(contributor_keys) + ["cycle", "source", "cid"]
-
-        with open(file_name, "w") as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=csv_headers)
-            writer.writeheader()
-
-            for row in contributor_list:
-                data = {
-                    "cycle": contributor_data["cycle"],
-                    "source": contributor_data["source"],
-                    "cid": cid,
-                    **row,
-                }
-                writer.writerow(data)
-
-        print(f"wrote file {file_name}")
+        contributions = [
+            records.from_row("contributors", {
+                **item["@attributes"],
+                "cycle": contributor_data["cycle"],
+                "source": contributor_data["source"],
+                "cid": cid,
+            })
+            for item in contributor_data["contributors"]
+        ]
+        write_records("contributors", output_path("contributors", cid, cycle), contributions, stager=self.stager)
+
+
+def write_records(data_type, file_name, rows, stager=None):
+    """
+    Writes one candidate's records with the same columns as the seed for
+    data_type, so every file for a type lines up. The file is rendered in
+    full first and goes through the stager (see staging.py), so it's either
+    all there or not there at all. Without a stager it's written right away
+    """
+    if not rows:
+        # same as the API leaving the data out entirely, pull_cid records it as empty
+        raise KeyError(f"No {data_type} data for {file_name}")
+
+    content = render_csv(records.headers(data_type), [records.to_row(data_type, record) for record in rows])
+    (stager or OutputStager()).stage(file_name, content, len(rows))
+
+
+def output_path(data_type, cid, cycle):
+    # a new cycle's directory won't exist until the first file for it is written
+    os.makedirs(cycle_dir(data_type, cycle), exist_ok=True)
+    return cid_file_path(data_type, cid, cycle)
+
+
+def file_hash(file_path):
+    try:
+        with open(file_path, "rb") as infile:
+            return hashlib.sha256(infile.read()).hexdigest()
+    except FileNotFoundError:
+        return None
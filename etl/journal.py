@@ -0,0 +1,156 @@
+import csv
+import json
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from server.data.paths import DEFAULT_CYCLE
+
+OK = "ok"
+NOT_FOUND = "not_found"  # 404, mostly candidates too new to have data
+EMPTY = "empty"  # 200 but no data in the response
+ERROR = "error"  # anything else, always worth another try
+QUEUED = "queued"  # roster changed, pull again even if we already have data
+
+# what the hand edited failed_*_cids.py lists held, all 404s for the 2022 cycle
+# as of 11/2022. Imported as not_found with the existing files so a first run
+# with the journal doesn't spend calls on them again
+LEGACY_CYCLE = "2022"
+LEGACY_NOT_FOUND_CIDS = {
+    "sectors": ["N00027695", "N00051961", "N00052615"],
+    "industries": ["N00027695", "N00051961", "N00052615"],
+    "contributors": ["N00027695", "N00051961", "N00052615"],
+}
+
+
+class PullJournal(object):
+    """
+    Append-only jsonl log of every pull attempt, one line per (method, cycle, cid)
+    outcome with its status code and timestamp. Replaces the hand edited
+    failed_*_cids.py lists: the latest entry per (method, cycle, cid) is kept in a
+    dict so deciding whether to skip a candidate is a single lookup.
+
+    not_found / empty candidates get retried once retry_missing_after has passed,
+    new candidates eventually get data
+    """
+
+    def __init__(self, path="./data/pull_journal.jsonl", retry_missing_after=timedelta(days=14)):
+        self.path = Path(path)
+        self.retry_missing_after = retry_missing_after
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._load()
+
+    def record(self, method, cid, outcome, status=None, last_updated=None, cycle=DEFAULT_CYCLE):
+        """
+        last_updated is the API's own last_updated date for the data (MM/DD/YYYY),
+        when the endpoint gives us one
+        """
+        entry = {
+            "method": method,
+            "cycle": cycle,
+            "cid": cid,
+            "outcome": outcome,
+            "status": status,
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "last_updated": last_updated,
+        }
+        with self._lock:
+            with open(self.path, "a") as outfile:
+                outfile.write(json.dumps(entry) + "\n")
+            self._latest[(method, cycle, cid)] = entry
+
+    def latest(self, method, cid, cycle=DEFAULT_CYCLE):
+        return self._latest.get((method, cycle, cid))
+
+    def should_skip(self, method, cid, cycle=DEFAULT_CYCLE, now=None):
+        entry = self._latest.get((method, cycle, cid))
+        if entry is None:
+            return False
+
+        if entry["outcome"] == OK:
+            return True
+
+        if entry["outcome"] in (NOT_FOUND, EMPTY):
+            now = now or datetime.now()
+            return now - datetime.fromisoformat(entry["at"]) < self.retry_missing_after
+
+        return False
+
+    def queue(self, method, cids, cycle=DEFAULT_CYCLE):
+        """
+        Marks candidates to be pulled again by the next run, whatever their
+        last outcome was
+        """
+        for cid in cids:
+            self.record(method, cid, QUEUED, cycle=cycle)
+
+    def has_entries_for(self, method, cycle=DEFAULT_CYCLE):
+        return any(key[:2] == (method, cycle) for key in self._latest.keys())
+
+    def import_existing_files(self, method, dir_path, cycle=DEFAULT_CYCLE):
+        """
+        One time migration for data pulled before the journal existed,
+        every CID.csv already on disk counts as a successful pull and the old
+        failed lists' cids as not_found (retried after retry_missing_after)
+        """
+        for path in Path(dir_path).glob("*.csv"):
+            with open(path) as infile:
+                first_row = next(csv.DictReader(infile), {})
+            self.record(
+                method,
+                path.stem,
+                OK,
+                status=200,
+                last_updated=first_row.get("last_updated"),
+                cycle=cycle,
+            )
+
+        if cycle == LEGACY_CYCLE:
+            for cid in LEGACY_NOT_FOUND_CIDS.get(method, []):
+                # a file on disk wins, it was pulled after the list was written
+                if (method, cycle, cid) not in self._latest:
+                    self.record(method, cid, NOT_FOUND, status=404, cycle=cycle)
+
+    def stalest(self, method, cycle=DEFAULT_CYCLE):
+        """
+        CIDs with a successful pull for this method, the ones most likely to be
+        out of date first: oldest last_updated, then oldest pull
+        """
+        entries = [
+            entry for (key_method, key_cycle, _), entry in self._latest.items()
+            if (key_method, key_cycle) == (method, cycle) and entry["outcome"] == OK
+        ]
+        entries.sort(key=lambda entry: (parse_last_updated(entry.get("last_updated")), entry["at"]))
+        return [entry["cid"] for entry in entries]
+
+    def failures(self, method, cycle=DEFAULT_CYCLE):
+        return sorted(
+            cid
+            for (key_method, key_cycle, cid), entry in self._latest.items()
+            if (key_method, key_cycle) == (method, cycle) and entry["outcome"] not in (OK, QUEUED)
+        )
+
+    def _load(self):
+        if not self.path.exists():
+            return
+
+        with open(self.path) as infile:
+            for line in infile:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # a crash mid-write can leave a partial last line behind
+                    continue
+                # entries from before cycles were tracked are all the default cycle
+                cycle = entry.get("cycle", DEFAULT_CYCLE)
+                self._latest[(entry["method"], cycle, entry["cid"])] = entry
+
+
+def parse_last_updated(value):
+    # the API formats these as MM/DD/YYYY, missing sorts first so it gets refreshed
+    if not value:
+        return datetime.min
+    return datetime.strptime(value, "%m/%d/%Y")
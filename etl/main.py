@@ -1,4 +1,14 @@
-from flask import Flask
+import os
+import time
+
+from flask import Flask, Response, abort, g, jsonify, request
+
+from rankings import MEASURES, RANKED_COLUMNS, RankingIndex
+from response_cache import ResponseCache
+from search import SearchIndex
+from server.metrics import metrics
+from sqlite_backend import SqliteStore
+from store import DataStore
 
 app = Flask(__name__)
 
@@ -6,6 +16,40 @@ app = Flask(__name__)
 # Just create the files you need and load them up at module import time
 # and keep in memory, shouldn't take up too much space this data isn't large
 # https://www.pythonanywhere.com/forums/topic/27680/
+# DATA_SOURCE=sqlite serves the same routes out of a local SQLite database instead
+if os.environ.get("DATA_SOURCE", "memory") == "sqlite":
+    store = SqliteStore()
+else:
+    store = DataStore()
+
+# every response serialized, hashed and compressed once up front
+responses = ResponseCache(store)
+rankings = RankingIndex(store.cycle)
+search_index = SearchIndex(store.cycle)
+
+
+@app.before_request
+def start_timer():
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_latency(response):
+    if metrics.enabled and "request_start" in g:
+        # the rule, not the path, so /reps/<cid> is one series and not one per rep
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        metrics.observe("http_request_seconds", time.perf_counter() - g.request_start, route=route, status=response.status_code)
+
+    return response
+
+
+def cached(key):
+    response = responses.respond(key)
+    if response is None:
+        abort(404)
+
+    return response
 
 
 @app.route("/", methods=["GET"])
@@ -16,20 +60,67 @@ def hello_world():
 
 @app.route("/states", methods=["GET"])
 def state_summaries():
-    return "<p>Hello, World!</p>"
+    return cached("states")
 
 
 @app.route("/states/<state_code>", methods=["GET"])
 def state_by_code(state_code):
-    print(f"the state code {state_code}")
-    return f"<p>Hello, {state_code}!</p>"
+    return cached(f"states/{state_code.upper()}")
 
 
 @app.route("/reps", methods=["GET"])
 def list_representatives():
-    return f"<p>Hello, list_representatives</p>"
+    return cached("reps")
 
 
 @app.route("/reps/<cid>", methods=["GET"])
 def get_rep_by_cid(cid):
-    return f"<p>candidate id: {cid}</p>"
+    return cached(f"reps/{cid}")
+
+
+@app.route("/map", methods=["GET"])
+def map_payload():
+    # ?topology=1 includes the state shapes too, if they've been downloaded
+    return cached("map/topology" if request.args.get("topology") else "map")
+
+
+@app.route("/rankings/<data_type>", methods=["GET"])
+def top_ranked(data_type):
+    # e.g. /rankings/contributors?n=10&state=NJ&party=D&by=pacs
+    measure = request.args.get("by", "total")
+    n = request.args.get("n", 10, type=int)
+    if data_type not in RANKED_COLUMNS:
+        abort(404)
+    if measure not in MEASURES or n < 0:
+        abort(400)
+
+    return jsonify(
+        rankings.top(
+            data_type,
+            n=n,
+            state=request.args.get("state"),
+            party=request.args.get("party"),
+            measure=measure,
+        )
+    )
+
+
+@app.route("/search", methods=["GET"])
+def search():
+    # typeahead, e.g. /search?q=cassidy&type=contributor
+    return jsonify(
+        search_index.search(
+            request.args.get("q", ""),
+            limit=request.args.get("limit", 10, type=int),
+            kind=request.args.get("type"),
+        )
+    )
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_text():
+    # Prometheus text format, 404 unless the app was started with METRICS=1
+    if not metrics.enabled:
+        abort(404)
+
+    return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
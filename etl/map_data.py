@@ -0,0 +1,69 @@
+import json
+import os
+
+import requests
+
+from server.constants.states import STATE_FIPS_MAP
+
+# only the state shapes, already simplified and projected so the browser
+# can draw it with a plain d3.geoPath()
+TOPOLOGY_URL = "https://cdn.jsdelivr.net/npm/us-atlas@3/states-albers-10m.json"
+TOPOLOGY_PATH = "./data/map/states-albers-10m.json"
+
+# each state in the map payload is one row of these, keyed by its FIPS code
+MAP_COLUMNS = ["state", "name", "indivs", "pacs", "total", "raised", "rep_count"]
+
+
+def build_map_payload(states, cycle, topology=None):
+    """
+    Everything the choropleth needs in one response, built from a store's
+    states() so there's no need for a request per state
+    """
+    rows = {}
+    for summary in states:
+        sector_totals = summary["sector_totals"]
+        rows[STATE_FIPS_MAP[summary["state"]]] = [
+            summary["state"],
+            summary["name"],
+            sector_totals["indivs"],
+            sector_totals["pacs"],
+            sector_totals["total"],
+            summary["fundraising"].get("total"),
+            summary["rep_count"],
+        ]
+
+    return {
+        "cycle": cycle,
+        "columns": MAP_COLUMNS,
+        "states": rows,
+        "topology": topology,
+    }
+
+
+def download_topology(url=TOPOLOGY_URL, file_path=TOPOLOGY_PATH):
+    """
+    One time fetch of the us-atlas state shapes so the app can serve them
+    itself. Drops the nation outline, the map only draws states
+    """
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+
+    topology = response.json()
+    topology["objects"] = {"states": topology["objects"]["states"]}
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w") as outfile:
+        json.dump(topology, outfile, separators=(",", ":"))
+    os.replace(tmp_path, file_path)
+
+    print(f"Saved state topology to {file_path}")
+
+
+def load_topology(file_path=TOPOLOGY_PATH):
+    # not required, without it the frontend falls back to the CDN
+    try:
+        with open(file_path) as infile:
+            return json.load(infile)
+    except FileNotFoundError:
+        return None
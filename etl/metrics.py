@@ -0,0 +1,176 @@
+"""
+Timings and counts from the hot paths (API calls, per candidate pulls, the
+ETL, the Flask routes). Off unless METRICS=1 is set or metrics.enable() is
+called, and every instrumented spot checks metrics.enabled first so a
+disabled run pays for one attribute lookup and nothing else.
+
+While enabled everything is aggregated in memory (histograms and counters,
+served as Prometheus text on /metrics), and also handed to any sinks, e.g.
+METRICS_LOG=./data/metrics.jsonl writes one json line per observation
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# seconds, wide enough for a cache hit up to a whole seed build
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HISTOGRAM = "histogram"
+COUNTER = "counter"
+
+
+class JsonLinesSink(object):
+    """
+    Appends every observation to a file as a json line, for working out
+    afterwards where a run spent its time. Fine to share between threads
+    and between the ETL's worker processes, each line is one write
+    """
+
+    def __init__(self, file_path="./data/metrics.jsonl"):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, value, labels):
+        line = json.dumps({"ts": round(time.time(), 3), "kind": kind, "name": name, "value": value, **labels})
+        with self._lock, open(self.file_path, "a") as outfile:
+            outfile.write(line + "\n")
+
+
+class Metrics(object):
+    """
+    One per process, use the module level `metrics`.
+
+    observe() adds a value (seconds) to a histogram and inc() bumps a counter,
+    both keyed by name plus labels. Keep label values low cardinality, a
+    method or a route, never a cid
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.enabled = False
+        self.buckets = buckets
+        self.sinks = []
+        self._lock = threading.Lock()
+        self._histograms = {}  # (name, labels) -> [count per bucket..., +Inf count, sum]
+        self._counters = {}  # (name, labels) -> value
+
+    def enable(self, sinks=None):
+        self.sinks = list(sinks or [])
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+
+        # as strings, a status can be 200 or Timeout and render() sorts the keys
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(self.buckets) + 2)
+            # bucket counts are per bucket here, render() makes them cumulative
+            histogram[bisect_left(self.buckets, value)] += 1
+            histogram[-1] += value
+
+        for sink in self.sinks:
+            sink.record(HISTOGRAM, name, value, labels)
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+
+        # as strings, a status can be 200 or Timeout and render() sorts the keys
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+        for sink in self.sinks:
+            sink.record(COUNTER, name, value, labels)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Times the with block into a histogram. Set labels on the yielded dict
+        to add ones only known at the end, like an outcome
+        """
+        if not self.enabled:
+            yield labels
+            return
+
+        start = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def summary(self):
+        """
+        Every histogram as (name, labels, count, total seconds, mean ms),
+        most total time first. The quick answer to where a run went
+        """
+        with self._lock:
+            histograms = list(self._histograms.items())
+
+        rows = []
+        for (name, labels), histogram in histograms:
+            count, total = sum(histogram[:-1]), histogram[-1]
+            rows.append((name, dict(labels), count, round(total, 3), round(1000 * total / count, 3)))
+
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def render(self):
+        """
+        Everything in the Prometheus text exposition format
+        """
+        with self._lock:
+            histograms = sorted((key, list(value)) for key, value in self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines = []
+        last_name = None
+        for (name, labels), histogram in histograms:
+            if name != last_name:
+                lines.append(f"# TYPE {name} {HISTOGRAM}")
+                last_name = name
+
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), histogram[:-1]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_label_text(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labels)} {histogram[-1]}")
+            lines.append(f"{name}_count{_label_text(labels)} {cumulative}")
+
+        for (name, labels), value in counters:
+            if name != last_name:
+                lines.append(f"# TYPE {name} {COUNTER}")
+                last_name = name
+            lines.append(f"{name}{_label_text(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
+
+if os.environ.get("METRICS") or os.environ.get("METRICS_LOG"):
+    metrics.enable([JsonLinesSink(os.environ["METRICS_LOG"])] if os.environ.get("METRICS_LOG") else [])
@@ -0,0 +1,306 @@
+import argparse
+import csv
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from server.data.paths import available_cycles, seed_path
+from server.data.utils import list_files_in_dir
+from quota import DAILY_CALL_LIMIT
+
+CALL_LIMIT_MESSAGE = "call limit has been reached"
+
+METHOD_DATA_TYPES = {
+    "candSummary": "summaries",
+    "candSector": "sectors",
+    "candIndustry": "industries",
+    "candContrib": "contributors",
+}
+
+# columns each endpoint returns per row, everything else in the seed goes in @attributes
+ROW_COLUMNS = {
+    "sectors": ["sector_name", "sectorid", "indivs", "pacs", "total"],
+    "industries": ["industry_code", "industry_name", "indivs", "pacs", "total"],
+    "contributors": ["org_name", "total", "pacs", "indivs"],
+}
+
+
+class Faults(object):
+    """
+    What can go wrong, and how often. Which request gets which fault is worked
+    out from a hash of the seed and the request's params, not a shared random
+    stream, so the same seed gives the same faults no matter how many threads
+    are pulling or in what order
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        jitter=0.0,
+        not_found_rate=0.0,
+        empty_rate=0.0,
+        server_error_rate=0.0,
+        daily_limit=None,
+        seed=0,
+    ):
+        """
+        latency / jitter are seconds, each response waits latency +- jitter
+        the rates are fractions of requests, 0 to 1
+        daily_limit is calls per method before every call gets the call limit 400,
+        None for no limit (the real API's is quota.DAILY_CALL_LIMIT)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.not_found_rate = not_found_rate
+        self.empty_rate = empty_rate
+        self.server_error_rate = server_error_rate
+        self.daily_limit = daily_limit
+        self.seed = seed
+
+    def roll(self, method, params, salt=""):
+        """
+        A number in [0, 1) that's always the same for the same request
+        """
+        key = json.dumps([self.seed, salt, method, sorted(params.items())])
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+    def delay(self, method, params):
+        if not self.latency and not self.jitter:
+            return 0.0
+        return max(0.0, self.latency + self.jitter * (2 * self.roll(method, params, "latency") - 1))
+
+    def fault(self, method, params, attempt=0):
+        """
+        None, "not_found", "empty" or "server_error" for one request. A
+        candidate with no data has none on every attempt, a server error
+        is rolled again on each retry (attempt counts calls with the same params)
+        """
+        roll = self.roll(method, params, "fault")
+        if roll < self.not_found_rate:
+            return "not_found"
+        if roll < self.not_found_rate + self.empty_rate:
+            return "empty"
+        if self.roll(method, params, f"server_error_{attempt}") < self.server_error_rate:
+            return "server_error"
+
+        return None
+
+
+class MockApi(object):
+    """
+    Local stand in for the OpenSecrets API, answering from whatever
+    ./data/ has (the seeds and state files), in the same response shape
+    (response -> @attributes nesting). Start it, point a Client's base_url at
+    .url, stop it when done. Pass Faults to make it slow or flaky
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, faults=None):
+        self.faults = faults or Faults()
+        self.legislators = _read_legislators()
+        self.rows = {}  # (data_type, cycle) -> {cid: [rows]}
+        # ./data/seeds/ has one dir per cycle, same layout available_cycles expects
+        for cycle in available_cycles("seeds"):
+            for data_type in METHOD_DATA_TYPES.values():
+                self.rows[(data_type, cycle)] = _read_seed_by_cid(data_type, cycle)
+
+        self._lock = threading.Lock()
+        self.calls = Counter()  # method -> calls made, for the daily limit
+        self.attempts = Counter()  # (method, params) -> calls made, never reset
+        self.log = []  # (method, params, status) for every request, in arrival order
+
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset(self):
+        """
+        New day: call counts back to zero and an empty log. Attempts carry
+        over so a request that hit a server error can get through the next day
+        """
+        with self._lock:
+            self.calls.clear()
+            self.log = []
+
+    def status_counts(self):
+        with self._lock:
+            return Counter((method, status) for method, _, status in self.log)
+
+    def handle(self, method, params):
+        """
+        (status, body) for one API call, faults included
+        """
+        with self._lock:
+            self.calls[method] += 1
+            over_limit = self.faults.daily_limit is not None and self.calls[method] > self.faults.daily_limit
+            request_key = (method, json.dumps(params, sort_keys=True))
+            attempt = self.attempts[request_key]
+            self.attempts[request_key] += 1
+
+        delay = self.faults.delay(method, params)
+        if delay:
+            time.sleep(delay)
+
+        if over_limit:
+            status, body = 400, CALL_LIMIT_MESSAGE
+        else:
+            status, body = self.respond(method, params, fault=self.faults.fault(method, params, attempt))
+
+        with self._lock:
+            self.log.append((method, params, status))
+
+        return status, body
+
+    def respond(self, method, params, fault=None):
+        """
+        (status, body) for one API call
+        """
+        if fault == "not_found":
+            return 404, "Resource not found"
+        if fault == "server_error":
+            return 503, "Service Unavailable"
+
+        if method == "getLegislators":
+            legislators = self.legislators.get(params.get("id", ""))
+            if not legislators:
+                return 404, "Resource not found"
+            if fault == "empty":
+                return 200, {"response": {}}
+            return 200, {"response": {"legislator": [{"@attributes": row} for row in legislators]}}
+
+        data_type = METHOD_DATA_TYPES.get(method)
+        if data_type is None:
+            return 400, f"unknown method {method}"
+
+        cycle = params.get("cycle", "")
+        rows = self.rows.get((data_type, cycle), {}).get(params.get("cid", ""))
+        if not rows:
+            return 404, "Resource not found"
+
+        return 200, {"response": _response_body(data_type, rows, empty=fault == "empty")}
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive, so a pooled Client session reuses its connections
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in separate writes, don't let them wait on a delayed ack
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                params = {key: values[0] for key, values in query.items() if key not in ["apikey", "output"]}
+                status, body = mock.handle(params.pop("method", ""), params)
+
+                payload = json.dumps(body) if isinstance(body, dict) else body
+                encoded = payload.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json" if isinstance(body, dict) else "text/plain")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, *args):
+                # one line per request would drown out everything else
+                pass
+
+        return Handler
+
+
+def _response_body(data_type, rows, empty=False):
+    if data_type == "summaries":
+        return {} if empty else {"summary": {"@attributes": rows[0]}}
+
+    first = rows[0]
+    attributes = {
+        "cid": first["cid"],
+        "cycle": first["cycle"],
+        "origin": "OpenSecrets",
+        "source": first.get("source", "https://www.opensecrets.org/"),
+    }
+    if "last_updated" in first:
+        attributes["last_updated"] = first["last_updated"]
+
+    # an empty payload is the @attributes with no list, like a candidate too new to have data
+    items = [{"@attributes": {column: row[column] for column in ROW_COLUMNS[data_type]}} for row in rows]
+    if data_type == "sectors":
+        return {"sectors": {"@attributes": attributes, **({} if empty else {"sector": items})}}
+    if data_type == "industries":
+        return {"industries": {"@attributes": attributes, **({} if empty else {"industry": items})}}
+    return {"contributors": {"@attributes": attributes, **({} if empty else {"contributor": items})}}
+
+
+def _read_seed_by_cid(data_type, cycle):
+    rows_by_cid = {}
+    try:
+        with open(seed_path(data_type, cycle)) as infile:
+            for row in csv.DictReader(infile):
+                rows_by_cid.setdefault(row["cid"], []).append(row)
+    except FileNotFoundError:
+        pass
+
+    return rows_by_cid
+
+
+def _read_legislators():
+    legislators = {}
+    for file_name in list_files_in_dir("./data/states/"):
+        with open(f"./data/states/{file_name}") as infile:
+            legislators[file_name.split(".")[0]] = list(csv.DictReader(infile))
+
+    return legislators
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ./data/ as a fake OpenSecrets API")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--not-found-rate", type=float, default=0.0)
+    parser.add_argument("--empty-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--daily-limit", type=int, default=DAILY_CALL_LIMIT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    faults = Faults(
+        latency=args.latency,
+        jitter=args.jitter,
+        not_found_rate=args.not_found_rate,
+        empty_rate=args.empty_rate,
+        server_error_rate=args.server_error_rate,
+        daily_limit=args.daily_limit,
+        seed=args.seed,
+    )
+    mock = MockApi(port=args.port, faults=faults)
+    print(f"Mock OpenSecrets API on {mock.url}, Client(base_url=\"{mock.url}\")")
+    mock.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import json
+import threading
+from datetime import date
+from pathlib import Path
+
+from client import RateLimitError
+
+# OpenSecrets allows 200 calls per endpoint per day
+DAILY_CALL_LIMIT = 200
+
+OPENSECRETS_METHODS = [
+    "candSummary",
+    "candSector",
+    "candIndustry",
+    "candContrib",
+    "getLegislators",
+]
+
+
+class QuotaScheduler(object):
+    """
+    Keeps a daily token bucket per OpenSecrets method so we know we're out of
+    calls before the API tells us. State is saved to a small json file so runs
+    on the same day share one budget, and every bucket refills on a new day.
+
+    Hand this to Client(quota=...) and every request attempt takes a token
+    """
+
+    def __init__(
+        self,
+        state_path="./data/quota.json",
+        daily_limit=DAILY_CALL_LIMIT,
+        methods=OPENSECRETS_METHODS,
+        today=date.today,
+    ):
+        self.state_path = Path(state_path)
+        self.daily_limit = daily_limit
+        self.methods = list(methods)
+        self.today = today
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def remaining(self, method):
+        with self._lock:
+            self._refill_if_new_day()
+            return self._state["remaining"].get(method, self.daily_limit)
+
+    def acquire(self, method):
+        """
+        Takes one call from the method's budget, raises RateLimitError
+        without touching the network when there's nothing left
+        """
+        with self._lock:
+            self._refill_if_new_day()
+            remaining = self._state["remaining"].get(method, self.daily_limit)
+            if remaining <= 0:
+                raise RateLimitError(f"daily quota for {method} already used up")
+
+            self._state["remaining"][method] = remaining - 1
+            self._save()
+
+    def exhaust(self, method):
+        """
+        The API said we're out even though we thought we had calls left,
+        trust the API for the rest of the day
+        """
+        with self._lock:
+            self._refill_if_new_day()
+            self._state["remaining"][method] = 0
+            self._save()
+
+    def summary(self):
+        return {method: self.remaining(method) for method in self.methods}
+
+    def _refill_if_new_day(self):
+        today = self.today().isoformat()
+        if self._state["day"] != today:
+            self._state = self._fresh_state(today)
+            self._save()
+
+    def _fresh_state(self, day):
+        return {
+            "day": day,
+            "remaining": {method: self.daily_limit for method in self.methods},
+        }
+
+    def _load(self):
+        if self.state_path.exists():
+            with open(self.state_path) as infile:
+                return json.load(infile)
+
+        return self._fresh_state(self.today().isoformat())
+
+    def _save(self):
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as outfile:
+            json.dump(self._state, outfile)
+        tmp_path.replace(self.state_path)
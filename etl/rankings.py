@@ -0,0 +1,166 @@
+from server.data.aggregate import candidate_frame
+from server.data.columnar import read_seed_frame
+from server.data.paths import DEFAULT_CYCLE
+
+# data type -> the column it gets ranked by, same queries as the comments in schema/*.sql
+RANKED_COLUMNS = {
+    "contributors": "org_name",
+    "industries": "industry_name",
+    "sectors": "sector_name",
+}
+
+MEASURES = ["indivs", "pacs", "total"]
+
+
+class RankingIndex(object):
+    """
+    Pre-aggregated SUM(indivs) / SUM(pacs) / SUM(total) per contributor,
+    industry and sector, partitioned by state, party and state + party.
+    Each partition's sorted order is kept, so a top N is a slice.
+
+    Sums are kept per candidate too, so refreshing one candidate only
+    touches the partitions they're in instead of rescanning the seeds
+    """
+
+    def __init__(self, cycle=DEFAULT_CYCLE):
+        self.cycle = cycle
+        self.candidates = {}  # cid -> (state, party)
+        # data_type -> {cid: {name: [indivs, pacs, total]}}
+        self.contributions = {data_type: {} for data_type in RANKED_COLUMNS.keys()}
+        # data_type -> {cid: the partitions their contributions were added to}
+        self.partitions_by_cid = {data_type: {} for data_type in RANKED_COLUMNS.keys()}
+        # (data_type, (state, party)) -> {name: [indivs, pacs, total, candidate count]}
+        self.sums = {}
+        # (data_type, (state, party), measure) -> sorted [(name, indivs, pacs, total)],
+        # built on first use and dropped whenever that partition's sums change
+        self.rankings = {}
+        self._load()
+
+    def top(self, data_type="contributors", n=10, state=None, party=None, measure="total"):
+        """
+        The n biggest names by measure, optionally within one state and/or party
+        """
+        if data_type not in RANKED_COLUMNS:
+            raise NotImplementedError(f"Cannot rank {data_type}")
+        if measure not in MEASURES:
+            raise NotImplementedError(f"Cannot rank by {measure}")
+
+        partition = (state.upper() if state else None, party.upper() if party else None)
+        ranking = self._ranking(data_type, partition, measure)
+
+        return [
+            {"name": name, "indivs": indivs, "pacs": pacs, "total": total}
+            # a negative n would slice off the end instead of returning nothing
+            for name, indivs, pacs, total in ranking[:max(n, 0)]
+        ]
+
+    def update_candidate(self, data_type, cid, rows):
+        """
+        Swaps one candidate's contribution to every ranking they're part of
+        for `rows`, (name, indivs, pacs, total) tuples
+        """
+        contributions = {}
+        for name, indivs, pacs, total in rows:
+            values = contributions.setdefault(name, [0, 0, 0])
+            values[0] += indivs
+            values[1] += pacs
+            values[2] += total
+
+        old_contributions = self.contributions[data_type].pop(cid, {})
+        old_partitions = self.partitions_by_cid[data_type].pop(cid, [])
+        for partition in old_partitions:
+            self._apply(data_type, partition, old_contributions, sign=-1)
+
+        if not contributions:
+            return
+
+        partitions = self._partitions(cid)
+        for partition in partitions:
+            self._apply(data_type, partition, contributions, sign=1)
+
+        self.contributions[data_type][cid] = contributions
+        self.partitions_by_cid[data_type][cid] = partitions
+
+    def refresh_candidates(self, data_type, cids):
+        """
+        Re-reads just these candidates from the seed, e.g. with the cids
+        DataPuller.refresh_stale returns once it's patched the seed
+        """
+        cids = set(cids)
+        if not cids:
+            return
+
+        for row in candidate_frame(self.cycle).itertuples(index=False):
+            if row.cid in cids:
+                self.candidates[row.cid] = _candidate_attributes(row)
+
+        rows_by_cid = self._read_rows(data_type)
+        for cid in cids:
+            self.update_candidate(data_type, cid, rows_by_cid.get(cid, []))
+
+    def _load(self):
+        for row in candidate_frame(self.cycle).itertuples(index=False):
+            self.candidates[row.cid] = _candidate_attributes(row)
+
+        for data_type in RANKED_COLUMNS.keys():
+            for cid, rows in self._read_rows(data_type).items():
+                self.update_candidate(data_type, cid, rows)
+
+    def _read_rows(self, data_type):
+        # cid -> [(name, indivs, pacs, total)]
+        name_column = RANKED_COLUMNS[data_type]
+        frame = read_seed_frame(data_type, self.cycle, columns=["cid", name_column] + MEASURES)
+        frame = frame.dropna(subset=[name_column])
+        frame[MEASURES] = frame[MEASURES].fillna(0).astype("int64")
+
+        rows_by_cid = {}
+        for cid, name, indivs, pacs, total in frame.itertuples(index=False, name=None):
+            rows_by_cid.setdefault(cid, []).append((name, indivs, pacs, total))
+
+        return rows_by_cid
+
+    def _partitions(self, cid):
+        # everyone is in the overall ranking, plus their state, party and state + party
+        state, party = self.candidates.get(cid, (None, None))
+        partitions = [(None, None)]
+        if state:
+            partitions.append((state, None))
+        if party:
+            partitions.append((None, party))
+        if state and party:
+            partitions.append((state, party))
+
+        return partitions
+
+    def _apply(self, data_type, partition, contributions, sign):
+        sums = self.sums.setdefault((data_type, partition), {})
+        for name, values in contributions.items():
+            totals = sums.setdefault(name, [0, 0, 0, 0])
+            totals[0] += sign * values[0]
+            totals[1] += sign * values[1]
+            totals[2] += sign * values[2]
+            totals[3] += sign
+            if totals[3] == 0:
+                del sums[name]
+
+        for measure in MEASURES:
+            self.rankings.pop((data_type, partition, measure), None)
+
+    def _ranking(self, data_type, partition, measure):
+        key = (data_type, partition, measure)
+        if key not in self.rankings:
+            position = MEASURES.index(measure)
+            sums = self.sums.get((data_type, partition), {})
+            # ties broken by name so the order is stable between rebuilds
+            self.rankings[key] = sorted(
+                ((name, *totals[:3]) for name, totals in sums.items()),
+                key=lambda ranked: (-ranked[1 + position], ranked[0]),
+            )
+
+        return self.rankings[key]
+
+
+def _candidate_attributes(row):
+    state = row.state if isinstance(row.state, str) and row.state else None
+    party = row.party if isinstance(row.party, str) and row.party else None
+    return (state, party)
@@ -0,0 +1,110 @@
+import gzip
+import hashlib
+import json
+
+import brotli
+from flask import Response, request
+
+from map_data import build_map_payload, load_topology
+
+# how much CPU to spend compressing, only happens once at startup so go high
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+class CachedResponse(object):
+    """
+    One serialized JSON body with its strong ETag and pre-compressed copies
+    """
+
+    __slots__ = ["etag", "bodies"]
+
+    def __init__(self, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        # encoding -> bytes, "identity" is the plain body
+        self.bodies = {
+            "identity": body,
+            # mtime=0 so the same data always compresses to the same bytes
+            "gzip": gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+            "br": brotli.compress(body, quality=BROTLI_QUALITY),
+        }
+
+    def etag_for(self, encoding):
+        # each representation gets its own strong ETag, like apache's -gzip suffix
+        return self.etag if encoding == "identity" else f"{self.etag}-{encoding}"
+
+
+class ResponseCache(object):
+    """
+    Every response the API can give, serialized and compressed once from a
+    store (DataStore or SqliteStore). The data only changes when the ETL
+    reruns, so a request is a dict lookup plus an If-None-Match check
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.entries = {}  # key, e.g. "states/NJ" -> CachedResponse
+        self.build()
+
+    def build(self):
+        states = self.store.states()
+        entries = {
+            "states": CachedResponse(states),
+            "reps": CachedResponse(self.store.reps()),
+            "map": CachedResponse(build_map_payload(states, self.store.cycle)),
+        }
+        topology = load_topology()
+        entries["map/topology"] = (
+            CachedResponse(build_map_payload(states, self.store.cycle, topology))
+            if topology is not None else entries["map"]
+        )
+        for state in self.store.state_codes():
+            entries[f"states/{state}"] = CachedResponse(self.store.state(state))
+        for cid in self.store.cids():
+            entries[f"reps/{cid}"] = CachedResponse(self.store.rep(cid))
+
+        self.entries = entries
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def respond(self, key):
+        """
+        The Flask response for a cache key, or None if there isn't one
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        encoding = self._pick_encoding(entry)
+        etag = entry.etag_for(encoding)
+
+        # any representation the client already has is still good, the data is the same
+        known_etags = [entry.etag_for(candidate) for candidate in entry.bodies.keys()]
+        if any(request.if_none_match.contains(known) for known in known_etags):
+            response = Response(status=304)
+        else:
+            response = Response(entry.bodies[encoding], mimetype="application/json")
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+
+        response.set_etag(etag)
+        response.headers["Vary"] = "Accept-Encoding"
+        # pollers always revalidate, which is a 304 with no body when nothing changed
+        response.headers["Cache-Control"] = "no-cache"
+        # read only public data, fine for the map page to call it from anywhere
+        response.headers["Access-Control-Allow-Origin"] = "*"
+        return response
+
+    def _pick_encoding(self, entry):
+        accepted = request.accept_encodings
+        best = max(
+            (encoding for encoding in entry.bodies.keys() if encoding != "identity"),
+            # brotli wins a tie, it's smaller
+            key=lambda encoding: (accepted.quality(encoding), encoding == "br"),
+            default=None,
+        )
+        if best is not None and accepted.quality(best) > 0:
+            return best
+        return "identity"
@@ -0,0 +1,160 @@
+import csv
+import os
+
+from server.data.paths import cycle_dir
+from server.data.roster_index import roster_index
+
+STATES = "states"
+
+# getLegislators' attributes, the header for a state file written without rows
+STATE_FIELDS = [
+    "cid", "firstlast", "lastname", "party", "office", "gender", "first_elected", "exit_code",
+    "comments", "phone", "fax", "website", "webform", "congress_office", "bioguide_id",
+    "votesmart_id", "feccandid", "twitter_id", "youtube_url", "facebook_id", "birthdate",
+]
+
+# a change to either of these means the candidate's rows in the seeds are out
+# of date (state, chamber and party all come from them). Anything else, a new
+# phone number or website, only gets written to the state file
+PULL_FIELDS = ["office", "party"]
+
+
+class RosterDiff(object):
+    """
+    What a roster sync changed. added and removed are cid -> row, changed is
+    cid -> {field: (old, new)} for the PULL_FIELDS that differ
+    """
+
+    def __init__(self, added=None, removed=None, changed=None, written_states=None, skipped_states=None):
+        self.added = added or {}
+        self.removed = removed or {}
+        self.changed = changed or {}
+        self.written_states = written_states or []
+        self.skipped_states = skipped_states or []
+
+    def affected_cids(self):
+        """
+        The candidates that need their details pulled again
+        """
+        return sorted(set(self.added) | set(self.changed))
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return (
+            f"RosterDiff(added={sorted(self.added)}, removed={sorted(self.removed)}, "
+            f"changed={self.changed}, written_states={self.written_states}, "
+            f"skipped_states={self.skipped_states})"
+        )
+
+
+def diff_rosters(old, new):
+    """
+    old and new are cid -> row. A cid in both is changed, never removed and
+    added, whichever state's rows it came from
+    """
+    diff = RosterDiff()
+    for cid, row in new.items():
+        if cid not in old:
+            diff.added[cid] = row
+            continue
+
+        changes = {
+            field: (old[cid].get(field), row.get(field))
+            for field in PULL_FIELDS
+            if old[cid].get(field) != row.get(field)
+        }
+        if changes:
+            diff.changed[cid] = changes
+
+    for cid, row in old.items():
+        if cid not in new:
+            diff.removed[cid] = row
+
+    return diff
+
+
+def sync_state_files(fetched, states_dir=None):
+    """
+    fetched is state_code -> rows straight from getLegislators. Diffs them
+    against the state files on disk and only rewrites the files whose rows
+    actually changed. States that weren't fetched aren't touched or diffed,
+    so a partial sync never makes anyone look removed.
+
+    Moves between states are caught through the roster index: a cid new to
+    a fetched state but listed in another state's file is diffed against
+    that row (changed, not added), and a cid gone from a fetched state but
+    still listed in a state that wasn't fetched isn't counted as removed.
+    A state that came back with no rows is skipped like a failed fetch,
+    every state has at least two senators
+    """
+    states_dir = states_dir or cycle_dir(STATES)
+    # read before anything's rewritten, it's the roster as it was
+    index = roster_index(states_dir)
+
+    old, new = {}, {}
+    written_states, skipped_states = [], []
+    fetched_files = set()
+    for state_code, rows in sorted(fetched.items()):
+        if not rows:
+            skipped_states.append(state_code)
+            continue
+
+        file_path = state_file_path(state_code, states_dir)
+        fetched_files.add(os.path.basename(file_path))
+        existing = read_state_file(file_path)
+        old.update((row["cid"], row) for row in existing)
+        new.update((row["cid"], row) for row in rows)
+
+        # the API doesn't promise an order, only rewrite when the rows differ
+        if _by_cid(existing) != _by_cid(rows):
+            write_state_file(file_path, rows)
+            written_states.append(state_code)
+
+    for cid in new.keys() - old.keys():
+        entry = index.get(cid)
+        if entry is not None:
+            old[cid] = {"cid": cid, "office": entry.office, "party": entry.party}
+
+    listed_elsewhere = {
+        cid
+        for file_name, cids in index.cids_by_file().items()
+        if file_name not in fetched_files
+        for cid in cids
+    }
+    for cid in (old.keys() - new.keys()) & listed_elsewhere:
+        del old[cid]
+
+    diff = diff_rosters(old, new)
+    diff.written_states = written_states
+    diff.skipped_states = skipped_states
+    return diff
+
+
+def read_state_file(file_path):
+    try:
+        with open(file_path) as infile:
+            return list(csv.DictReader(infile))
+    except FileNotFoundError:
+        return []
+
+
+def write_state_file(file_path, rows):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    # written next to the old file and swapped in, a crash never leaves half a roster
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w") as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=list(rows[0].keys()) if rows else STATE_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, file_path)
+
+
+def state_file_path(state_code, states_dir=None):
+    return os.path.join(states_dir or cycle_dir(STATES), f"{state_code}.csv")
+
+
+def _by_cid(rows):
+    return {row["cid"]: dict(row) for row in rows}
@@ -0,0 +1,155 @@
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+
+from server.data.columnar import read_seed_frame
+from server.data.paths import DEFAULT_CYCLE
+
+REP = "rep"
+CONTRIBUTOR = "contributor"
+
+# an exact word match beats a prefix match, which beats a fuzzy trigram match
+EXACT_SCORE = 2.0
+PREFIX_SCORE = 1.0
+
+# within a tier of word matches reps come first, before the fuzzy score gets a say.
+# Among fuzzy only matches the similarity goes first, or any rep sharing a
+# trigram would bury the one contributor the typo was meant to find
+KIND_RANK = {REP: 1, CONTRIBUTOR: 0}
+
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+class SearchIndex(object):
+    """
+    Typeahead over rep names / offices and contributor org names.
+
+    Words go in a sorted list so a prefix is a bisect, and every name's
+    trigrams go in an inverted index so typos still find something,
+    e.g. "casidy asoc" finds "Cassidy & Assoc"
+    """
+
+    def __init__(self, cycle=DEFAULT_CYCLE):
+        self.cycle = cycle
+        self.documents = []  # doc id -> the result dict returned for it
+        self.popularity = []  # doc id -> tie breaker, bigger is better
+        self.trigram_counts = []  # doc id -> how many trigrams its text has
+        self.words = []  # every distinct word, sorted
+        self.word_documents = {}  # word -> doc ids
+        self.trigram_documents = {}  # trigram -> doc ids
+        self._load()
+
+    def search(self, query="", limit=10, kind=None):
+        terms = _words(query)
+        if not terms:
+            return []
+
+        scores = {}
+        for term in terms:
+            # best match for this term in each doc, "an" shouldn't count twice for "Angie Anderson"
+            term_scores = {}
+            position = bisect_left(self.words, term)
+            while position < len(self.words) and self.words[position].startswith(term):
+                word = self.words[position]
+                score = EXACT_SCORE if word == term else PREFIX_SCORE
+                for doc_id in self.word_documents[word]:
+                    if term_scores.get(doc_id, 0) < score:
+                        term_scores[doc_id] = score
+                position += 1
+
+            for doc_id, score in term_scores.items():
+                scores[doc_id] = scores.get(doc_id, 0) + score
+
+        if kind is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if self.documents[doc_id]["type"] == kind}
+
+        # only go fuzzy when the prefixes don't turn up enough, it's the slow part
+        similarities = self._similar(terms, kind) if len(scores) < limit else {}
+
+        best = heapq.nlargest(
+            limit,
+            scores.keys() | similarities.keys(),
+            key=lambda doc_id: self._rank(doc_id, scores.get(doc_id, 0), similarities.get(doc_id, 0)),
+        )
+        return [self.documents[doc_id] for doc_id in best]
+
+    def _rank(self, doc_id, score, similarity):
+        kind_rank = KIND_RANK[self.documents[doc_id]["type"]]
+        if score:
+            return (score, kind_rank, similarity, self.popularity[doc_id])
+
+        return (score, similarity, kind_rank, self.popularity[doc_id])
+
+    def _similar(self, terms, kind=None):
+        query_trigrams = _trigrams(terms)
+        # Counter over the chained postings does the counting in C
+        shared = Counter(chain.from_iterable(self.trigram_documents.get(trigram, ()) for trigram in query_trigrams))
+
+        # jaccard similarity of the two trigram sets
+        return {
+            doc_id: count / (len(query_trigrams) + self.trigram_counts[doc_id] - count)
+            for doc_id, count in shared.items()
+            if kind is None or self.documents[doc_id]["type"] == kind
+        }
+
+    def _load(self):
+        reps = read_seed_frame("states", columns=["cid", "firstlast", "lastname", "party", "office", "state"])
+        reps = reps.astype(object).where(reps.notna(), None)
+        for row in reps.itertuples(index=False):
+            self._add(
+                {
+                    "type": REP,
+                    "cid": row.cid,
+                    "name": row.firstlast,
+                    "party": row.party,
+                    "office": row.office,
+                    "state": row.state,
+                },
+                text=" ".join(value for value in [row.firstlast, row.lastname, row.office] if value),
+                # ahead of any contributor with the same scores
+                popularity=float("inf"),
+            )
+
+        contributors = read_seed_frame("contributors", self.cycle, columns=["org_name", "total"])
+        totals = contributors.dropna(subset=["org_name"]).groupby("org_name")["total"].sum()
+        for org_name, total in totals.items():
+            self._add(
+                {"type": CONTRIBUTOR, "name": org_name, "total": int(total)},
+                text=org_name,
+                popularity=int(total),
+            )
+
+        self.words = sorted(self.word_documents.keys())
+        # tuples are smaller than lists and these never change after the build
+        self.word_documents = {word: tuple(doc_ids) for word, doc_ids in self.word_documents.items()}
+        self.trigram_documents = {trigram: tuple(doc_ids) for trigram, doc_ids in self.trigram_documents.items()}
+
+    def _add(self, document, text, popularity):
+        doc_id = len(self.documents)
+        self.documents.append(document)
+        self.popularity.append(popularity)
+
+        words = _words(text)
+        trigrams = _trigrams(words)
+        self.trigram_counts.append(len(trigrams))
+
+        for word in set(words):
+            self.word_documents.setdefault(word, []).append(doc_id)
+        for trigram in trigrams:
+            self.trigram_documents.setdefault(trigram, []).append(doc_id)
+
+
+def _words(text):
+    return [word for word in NON_ALPHANUMERIC.split(str(text).lower()) if word]
+
+
+def _trigrams(words):
+    # padded so the start of a word counts for more, like postgres' pg_trgm
+    trigrams = set()
+    for word in words:
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    return trigrams
@@ -0,0 +1,318 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from server.constants.states import STATE_ABBREV_MAP
+from server.data.columnar import read_seed_frame
+from server.data.paths import DEFAULT_CYCLE, seed_path
+
+SCHEMA_DIR = Path(__file__).parent / "schema"
+
+# seed data type -> (table from schema/*.sql, {seed column: table column} where they differ)
+SEED_TABLES = {
+    "states": ("candidate_details", {"cid": "candidate_id"}),
+    "summaries": ("candidate_summaries", {"cid": "candidate_id", "cand_name": "name"}),
+    "contributors": ("contributors", {"cid": "candidate_id"}),
+    "industries": ("industries", {"cid": "candidate_id"}),
+    "sectors": ("sectors", {"cid": "candidate_id", "sectorid": "sector_id"}),
+}
+
+INDEXES = [
+    "CREATE INDEX idx_candidate_details_state ON candidate_details (state)",
+    "CREATE INDEX idx_candidate_summaries_state ON candidate_summaries (state)",
+    "CREATE INDEX idx_contributors_candidate_id ON contributors (candidate_id)",
+    "CREATE INDEX idx_contributors_org_name ON contributors (org_name)",
+    "CREATE INDEX idx_industries_candidate_id ON industries (candidate_id)",
+    "CREATE INDEX idx_industries_industry_name ON industries (industry_name)",
+    "CREATE INDEX idx_sectors_candidate_id ON sectors (candidate_id)",
+    "CREATE INDEX idx_sectors_sector_name ON sectors (sector_name)",
+]
+
+# First term reps have a blank state / chamber in their summary, fall back to the roster.
+# Reps in the roster without a summary are included too
+CANDIDATE_ATTRIBUTES_VIEW = """
+CREATE VIEW candidate_attributes AS
+SELECT
+    s.candidate_id,
+    COALESCE(NULLIF(s.state, ''), d.state) AS state,
+    COALESCE(NULLIF(s.party, ''), d.party) AS party,
+    COALESCE(NULLIF(s.chamber, ''), CASE WHEN substr(d.office, 3, 1) = 'S' THEN 'S' ELSE 'H' END) AS chamber
+FROM candidate_summaries s
+LEFT JOIN candidate_details d USING (candidate_id)
+UNION ALL
+SELECT
+    d.candidate_id,
+    d.state,
+    d.party,
+    CASE WHEN substr(d.office, 3, 1) = 'S' THEN 'S' ELSE 'H' END
+FROM candidate_details d
+WHERE d.candidate_id NOT IN (SELECT candidate_id FROM candidate_summaries)
+"""
+
+REP_LIST_COLUMNS = ["cid", "firstlast", "party", "office", "state"]
+
+# not in schema/*.sql, only the SQLite copy needs to know what it was built from
+BUILD_META_TABLE = "CREATE TABLE build_meta (key TEXT PRIMARY KEY, value TEXT)"
+
+
+def database_path(cycle=DEFAULT_CYCLE):
+    return f"./data/open_secrets_{cycle}.sqlite3"
+
+
+def seed_checksum(cycle=DEFAULT_CYCLE):
+    """
+    Hash of every seed the database is loaded from, an ETL run or
+    refresh_stale patching a seed changes it
+    """
+    digest = hashlib.sha256()
+    for data_type in SEED_TABLES.keys():
+        with open(seed_path(data_type, cycle), "rb") as infile:
+            digest.update(infile.read())
+
+    return digest.hexdigest()
+
+
+def built_checksum(db_path):
+    """
+    The seed checksum a database was built from, None if there's no database
+    or it's from before build_meta existed
+    """
+    if not os.path.exists(db_path):
+        return None
+
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        row = connection.execute("SELECT value FROM build_meta WHERE key = 'seed_checksum'").fetchone()
+    except sqlite3.Error:
+        return None
+    finally:
+        connection.close()
+
+    return row[0] if row else None
+
+
+def build_database(cycle=DEFAULT_CYCLE, db_path=None):
+    """
+    Builds a fresh SQLite database from the same DDL as the Postgres tables,
+    bulk loading every seed with executemany in a single transaction
+    """
+    db_path = db_path or database_path(cycle)
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        with connection:
+            for schema_file in sorted(SCHEMA_DIR.glob("*.sql")):
+                connection.executescript(schema_file.read_text())
+
+        # executescript commits on its own, everything from here is one transaction
+        with connection:
+            for data_type, (table, renames) in SEED_TABLES.items():
+                frame = read_seed_frame(data_type, cycle)
+                table_columns = [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+                frame = frame.rename(columns=renames)[table_columns]
+
+                placeholders = ", ".join("?" for _ in table_columns)
+                # the seeds have the odd duplicate candidate, last one wins like a re-pull would
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(table_columns)}) VALUES ({placeholders})",
+                    _sql_rows(frame),
+                )
+                print(f"Loaded {len(frame)} rows into {table}")
+
+            for statement in INDEXES:
+                connection.execute(statement)
+            connection.execute(CANDIDATE_ATTRIBUTES_VIEW)
+
+            connection.execute(BUILD_META_TABLE)
+            connection.execute(
+                "INSERT INTO build_meta (key, value) VALUES ('seed_checksum', ?)", (seed_checksum(cycle),)
+            )
+
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+
+    os.replace(tmp_path, db_path)
+    print(f"Saved database to {db_path}")
+
+
+class SqliteStore(object):
+    """
+    Same interface as store.DataStore but answers every request with a query
+    against the local SQLite database. Builds it first if it's missing or
+    the seeds have changed since it was built, same as the lookup artifacts
+    """
+
+    def __init__(self, cycle=DEFAULT_CYCLE, db_path=None):
+        self.cycle = cycle
+        self.db_path = db_path or database_path(cycle)
+        if built_checksum(self.db_path) != seed_checksum(cycle):
+            if os.path.exists(self.db_path):
+                print(f"Seeds changed since {self.db_path} was built, rebuilding")
+            build_database(cycle, self.db_path)
+
+        self._local = threading.local()
+
+    def query(self, sql, params=()):
+        return [dict(row) for row in self._connection().execute(sql, params)]
+
+    def states(self):
+        sector_totals = {
+            row["state"]: row for row in self.query(
+                """
+                SELECT a.state, SUM(s.indivs) AS indivs, SUM(s.pacs) AS pacs, SUM(s.total) AS total
+                FROM sectors s JOIN candidate_attributes a USING (candidate_id)
+                GROUP BY a.state
+                """
+            )
+        }
+        fundraising = {
+            row["state"]: row for row in self.query(
+                """
+                SELECT a.state, SUM(c.total) AS total, SUM(c.spent) AS spent,
+                    SUM(c.cash_on_hand) AS cash_on_hand, SUM(c.debt) AS debt
+                FROM candidate_summaries c JOIN candidate_attributes a USING (candidate_id)
+                GROUP BY a.state
+                """
+            )
+        }
+        rep_counts = {
+            row["state"]: row["rep_count"] for row in self.query(
+                "SELECT state, COUNT(*) AS rep_count FROM candidate_attributes GROUP BY state"
+            )
+        }
+
+        return [
+            self._state_summary(state, sector_totals.get(state), fundraising.get(state), rep_counts.get(state, 0))
+            for state in STATE_ABBREV_MAP.keys()
+        ]
+
+    def state(self, state_code):
+        state_code = state_code.upper()
+        if state_code not in STATE_ABBREV_MAP:
+            return None
+
+        sector_totals = self.query(
+            """
+            SELECT SUM(s.indivs) AS indivs, SUM(s.pacs) AS pacs, SUM(s.total) AS total
+            FROM sectors s JOIN candidate_attributes a USING (candidate_id)
+            WHERE a.state = ?
+            """,
+            (state_code,),
+        )[0]
+        fundraising = self.query(
+            """
+            SELECT SUM(c.total) AS total, SUM(c.spent) AS spent,
+                SUM(c.cash_on_hand) AS cash_on_hand, SUM(c.debt) AS debt
+            FROM candidate_summaries c JOIN candidate_attributes a USING (candidate_id)
+            WHERE a.state = ?
+            """,
+            (state_code,),
+        )[0]
+        reps = self.query(
+            """
+            SELECT a.candidate_id AS cid, d.firstlast, a.party, d.office, a.state
+            FROM candidate_attributes a LEFT JOIN candidate_details d USING (candidate_id)
+            WHERE a.state = ?
+            ORDER BY a.candidate_id
+            """,
+            (state_code,),
+        )
+
+        summary = self._state_summary(state_code, sector_totals, fundraising, len(reps))
+        summary["reps"] = reps
+        return summary
+
+    def reps(self):
+        return self.query(
+            "SELECT candidate_id AS cid, firstlast, party, office, state FROM candidate_details"
+        )
+
+    def rep(self, cid):
+        rows = {
+            data_type: self._seed_rows(data_type, cid) for data_type in SEED_TABLES.keys()
+        }
+        if not any(rows.values()):
+            return None
+
+        return {
+            "cid": cid,
+            "cycle": self.cycle,
+            "details": rows["states"][0] if rows["states"] else None,
+            "summary": rows["summaries"][0] if rows["summaries"] else None,
+            "sector_totals": {
+                measure: sum(row[measure] or 0 for row in rows["sectors"])
+                for measure in ["indivs", "pacs", "total"]
+            },
+            "sectors": rows["sectors"],
+            "industries": rows["industries"],
+            "contributors": rows["contributors"],
+        }
+
+    def state_codes(self):
+        return list(STATE_ABBREV_MAP.keys())
+
+    def cids(self):
+        union = " UNION ".join(f"SELECT candidate_id FROM {table}" for table, _ in SEED_TABLES.values())
+        return [row["candidate_id"] for row in self.query(f"{union} ORDER BY candidate_id")]
+
+    def _seed_rows(self, data_type, cid):
+        # rename the columns back so responses look the same as the in memory store
+        table, renames = SEED_TABLES[data_type]
+        reverse = {table_column: seed_column for seed_column, table_column in renames.items()}
+        return [
+            {reverse.get(column, column): value for column, value in row.items()}
+            for row in self.query(f"SELECT * FROM {table} WHERE candidate_id = ?", (cid,))
+        ]
+
+    def _state_summary(self, state, sector_totals, fundraising, rep_count):
+        sector_totals = sector_totals or {}
+        fundraising = fundraising or {}
+        return {
+            "state": state,
+            "name": STATE_ABBREV_MAP[state].strip(),
+            "cycle": self.cycle,
+            "sector_totals": {
+                measure: sector_totals.get(measure) or 0 for measure in ["indivs", "pacs", "total"]
+            },
+            "fundraising": {
+                measure: round(fundraising[measure], 2)
+                for measure in ["total", "spent", "cash_on_hand", "debt"]
+                if fundraising.get(measure) is not None
+            },
+            "rep_count": rep_count,
+        }
+
+    def _connection(self):
+        # sqlite connections can't be shared across threads, one per request thread
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+
+        return connection
+
+
+def _sql_rows(frame):
+    for row in frame.itertuples(index=False, name=None):
+        yield tuple(_sql_value(value) for value in row)
+
+
+def _sql_value(value):
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.date().isoformat()
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    return value
@@ -0,0 +1,179 @@
+import csv
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# files held in memory before a batch gets written out, ~50 csvs is well under a MB
+DEFAULT_BATCH_SIZE = 50
+
+# a temp file only lives for the length of one write, anything older is from a crash
+STALE_TMP_SECONDS = 60
+
+
+class WriteVerificationError(Exception):
+    pass
+
+
+class OutputStager(object):
+    """
+    Staging area for the per candidate csvs. Each file is rendered in memory
+    in full, written to a temp file next to its destination, read back to
+    check its row count and only then renamed over it, so a crash or rate
+    limit half way through never leaves a partial file behind. No fsync, a file lost to a
+    power cut just gets pulled again (the raw response is still in the cache).
+
+    Outside of batch() every file is committed as soon as it's staged. Inside,
+    files wait in memory and get written batch_size at a time, and anything
+    passed to when_committed (the journal entry) only runs once it's on disk
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        # one commit at a time, a file is never written by two threads at once
+        self._commit_lock = threading.Lock()
+        self._pending = {}  # file path -> (content, row count, [callbacks])
+        self._batches = 0
+
+    def stage(self, file_path, content, row_count):
+        """
+        content is the whole file, row_count how many data rows it should have
+        """
+        with self._lock:
+            # the same file staged twice in a batch, the newer content wins
+            callbacks = self._pending.pop(file_path, (None, None, []))[2]
+            self._pending[file_path] = (content, row_count, callbacks)
+            should_commit = not self._batches or len(self._pending) >= self.batch_size
+
+        if should_commit:
+            self.commit()
+
+    def when_committed(self, file_path, callback):
+        """
+        Runs callback once file_path is on disk, right away if it already is
+        """
+        with self._lock:
+            pending = self._pending.get(file_path)
+            if pending is not None:
+                pending[2].append(callback)
+                return
+
+        callback()
+
+    def commit(self):
+        """
+        Writes out everything staged so far, returns the paths written
+        """
+        with self._commit_lock:
+            with self._lock:
+                pending = dict(self._pending)
+
+            for file_path, (content, row_count, _) in pending.items():
+                write_atomically(file_path, content, row_count)
+                print(f"wrote file {file_path}")
+
+            # they stay pending until they're on disk so when_committed can't jump
+            # the gun. Anything staged again in the meantime waits for the next commit
+            committed = []
+            with self._lock:
+                for file_path, staged in pending.items():
+                    if self._pending.get(file_path) is staged:
+                        del self._pending[file_path]
+                        committed.append(file_path)
+
+            # only after every file in the batch made it
+            for file_path in committed:
+                for callback in pending[file_path][2]:
+                    callback()
+
+        return committed
+
+    @contextmanager
+    def batch(self, dirs=()):
+        """
+        Holds files back and writes them batch_size at a time for the length
+        of the with block, whatever's left gets written on the way out, even
+        if the block raised (every staged file is complete on its own).
+
+        dirs are the directories the batch writes to, temp files a crash left
+        in them get cleaned up first
+        """
+        for dir_path in dirs:
+            remove_stale_tmp_files(dir_path)
+
+        with self._lock:
+            self._batches += 1
+        try:
+            yield self
+        except BaseException:
+            self._end_batch()
+            try:
+                self.commit()
+            except Exception as e:
+                # the error that ended the batch, e.g. a rate limit, is the one the caller handles
+                print(f"Couldn't write out the staged files: {e}")
+            raise
+
+        self._end_batch()
+        self.commit()
+
+    def _end_batch(self):
+        with self._lock:
+            self._batches -= 1
+
+
+def render_csv(headers, rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=headers)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def count_rows(file_path):
+    # parsed back rather than counting newlines, quoted fields can have them
+    with open(file_path, newline="", encoding="utf-8") as infile:
+        return sum(1 for _ in csv.reader(infile)) - 1
+
+
+def write_atomically(file_path, content, row_count=None):
+    """
+    Writes content to a temp file and renames it over file_path, but only once
+    the temp file reads back at full size and, if given, with row_count data rows
+    """
+    encoded = content.encode("utf-8")
+    # unique per process and thread, two pulls of the same cid never share a temp file
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as outfile:
+        outfile.write(encoded)
+
+    if os.path.getsize(tmp_path) != len(encoded):
+        os.remove(tmp_path)
+        raise WriteVerificationError(f"{file_path} came out short, not replacing it")
+
+    if row_count is not None:
+        written = count_rows(tmp_path)
+        if written != row_count:
+            os.remove(tmp_path)
+            raise WriteVerificationError(f"{file_path} came out with {written} rows, expected {row_count}")
+
+    os.replace(tmp_path, file_path)
+
+
+def remove_stale_tmp_files(dir_path, max_age=STALE_TMP_SECONDS):
+    """
+    Deletes the temp files a crashed write left in dir_path. Only ones older
+    than max_age, a newer one can still be another process's write in progress
+    """
+    if not os.path.isdir(dir_path):
+        return
+
+    cutoff = time.time() - max_age
+    for entry in os.scandir(dir_path):
+        if entry.name.endswith(".tmp") and entry.is_file() and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from server.constants.states import STATE_ABBREV_MAP
+from server.data.aggregate import aggregate_to_dict, candidate_frame
+from server.data.columnar import read_seed_frame
+from server.data.paths import DEFAULT_CYCLE
+
+DATA_TYPES = ["contributors", "industries", "sectors", "states", "summaries"]
+
+# what the list endpoints show per rep, the detail endpoint has everything
+REP_LIST_COLUMNS = ["cid", "firstlast", "party", "office", "state"]
+
+
+class DataStore(object):
+    """
+    Read only, in memory copy of the five seed datasets for the Flask app.
+
+    Each dataset is held as one numpy array per column, with a hash index from
+    cid (and state) to row positions. The per state and per candidate responses
+    are put together once at load, so serving a route is a dict lookup and
+    never touches disk
+    """
+
+    def __init__(self, cycle=DEFAULT_CYCLE):
+        self.cycle = cycle
+        self.columns = {}  # data_type -> {column: np.ndarray}
+        self.rows_by_cid = {}  # data_type -> {cid: np.ndarray of row positions}
+        self.cids_by_state = {}
+        self.state_rollups = {}
+        self.candidate_rollups = {}
+        self.rep_list = []
+        self._load()
+
+    def states(self):
+        return [self._state_summary(state) for state in self.state_rollups.keys()]
+
+    def state(self, state_code):
+        return self.state_rollups.get(state_code.upper())
+
+    def reps(self):
+        return self.rep_list
+
+    def rep(self, cid):
+        return self.candidate_rollups.get(cid)
+
+    def state_codes(self):
+        return list(self.state_rollups.keys())
+
+    def cids(self):
+        return sorted(self.candidate_rollups.keys())
+
+    def rows(self, data_type, cid):
+        """
+        Every row for one candidate in one dataset, as plain dicts
+        """
+        positions = self.rows_by_cid[data_type].get(cid)
+        if positions is None:
+            return []
+
+        columns = self.columns[data_type]
+        return [
+            {name: _to_python(values[position]) for name, values in columns.items()}
+            for position in positions
+        ]
+
+    def _load(self):
+        for data_type in DATA_TYPES:
+            frame = read_seed_frame(data_type, self.cycle)
+            self.columns[data_type] = {
+                column: _column_array(frame[column]) for column in frame.columns
+            }
+            self.rows_by_cid[data_type] = {
+                cid: positions for cid, positions in frame.groupby("cid", sort=False).indices.items()
+            }
+
+        candidates = candidate_frame(self.cycle)
+        for state, cids in candidates.groupby("state")["cid"]:
+            self.cids_by_state[state] = list(cids)
+
+        self.rep_list = [
+            {column: _to_python(value) for column, value in zip(REP_LIST_COLUMNS, row)}
+            for row in zip(*[self.columns["states"][column] for column in REP_LIST_COLUMNS])
+        ]
+
+        all_cids = set()
+        for rows_by_cid in self.rows_by_cid.values():
+            all_cids.update(rows_by_cid.keys())
+        for cid in all_cids:
+            self.candidate_rollups[cid] = self._build_candidate_rollup(cid)
+
+        sector_totals = aggregate_to_dict("sectors", by=["state"], cycles=[self.cycle])
+        summary_totals = aggregate_to_dict("summaries", by=["state"], cycles=[self.cycle])
+        for state, name in STATE_ABBREV_MAP.items():
+            cids = self.cids_by_state.get(state, [])
+            self.state_rollups[state] = {
+                "state": state,
+                "name": name.strip(),
+                "cycle": self.cycle,
+                "sector_totals": sector_totals.get(state, {"indivs": 0, "pacs": 0, "total": 0}),
+                "fundraising": summary_totals.get(state, {}),
+                "rep_count": len(cids),
+                "reps": [self._rep_list_entry(cid) for cid in cids],
+            }
+
+    def _build_candidate_rollup(self, cid):
+        details = self.rows("states", cid)
+        summary = self.rows("summaries", cid)
+        sectors = self.rows("sectors", cid)
+
+        return {
+            "cid": cid,
+            "cycle": self.cycle,
+            "details": details[0] if details else None,
+            "summary": summary[0] if summary else None,
+            "sector_totals": {
+                measure: sum(row[measure] or 0 for row in sectors)
+                for measure in ["indivs", "pacs", "total"]
+            },
+            "sectors": sectors,
+            "industries": self.rows("industries", cid),
+            "contributors": self.rows("contributors", cid),
+        }
+
+    def _rep_list_entry(self, cid):
+        details = self.candidate_rollups.get(cid, {}).get("details") or {"cid": cid}
+        return {column: details.get(column) for column in REP_LIST_COLUMNS}
+
+    def _state_summary(self, state):
+        rollup = self.state_rollups[state]
+        return {key: value for key, value in rollup.items() if key != "reps"}
+
+
+def _column_array(series):
+    # nullable ints and strings become plain object arrays with None for missing,
+    # dates become ISO strings so they serialize as is
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return np.array([value.date().isoformat() if not pd.isna(value) else None for value in series], dtype=object)
+    if pd.api.types.is_float_dtype(series):
+        return series.to_numpy()
+    return series.astype(object).where(series.notna(), None).to_numpy()
+
+
+def _to_python(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
@@ -2,20 +2,39 @@
 
 // const projection = d3.geoAlbersUsa().scale(1300).translate([487.5, 305])
 
+// Flask app from etl/, `make run`
+const API_URL = "http://localhost:5000";
+const TOPOLOGY_URL = "https://cdn.jsdelivr.net/npm/us-atlas@3/states-albers-10m.json";
+
 const mapContainer = document.getElementById("map");
 const width = mapContainer.clientWidth;
 const height = mapContainer.clientHeight;
 
 const getData = async () => {
-  return await d3.json("https://cdn.jsdelivr.net/npm/us-atlas@3/counties-albers-10m.json");
+  // one request for the state totals and, if the server has them, the state shapes
+  const payload = await d3.json(`${API_URL}/map?topology=1`);
+  const topology = payload.topology || await d3.json(TOPOLOGY_URL);
+
+  // rows come back as arrays, turn them into objects keyed by FIPS code
+  const totals = new Map(
+    Object.entries(payload.states).map(([fips, row]) => [
+      fips,
+      Object.fromEntries(payload.columns.map((column, i) => [column, row[i]])),
+    ])
+  );
+
+  return { topology, totals };
 }
 
 const main = async () => {
-  const data = await getData();
-  const { features } = topojson.feature(data, data.objects.states);
+  const { topology, totals } = await getData();
+  const { features } = topojson.feature(topology, topology.objects.states);
   // const { features } = topojson.feature(data, data.objects.counties);
   console.log("fetched data");
 
+  const color = d3.scaleSequential(d3.interpolateBlues)
+    .domain([0, d3.max(totals.values(), (state) => state.total)]);
+
   // const projection = d3.geoAlbersUsa()
   //   .scale(100)
   //   .translate([width / 2, height / 2]);
@@ -32,7 +51,13 @@ const main = async () => {
       .enter()
       .append("path")
       .attr("class", "state")
-      .attr("d", path);
+      .attr("fill", (feature) => totals.has(feature.id) ? color(totals.get(feature.id).total) : "#e3e3e3")
+      .attr("d", path)
+      .append("title")
+      .text((feature) => {
+        const state = totals.get(feature.id);
+        return state ? `${state.name}: $${d3.format(",")(state.total)}` : feature.properties.name;
+      });
 }
 
 main();